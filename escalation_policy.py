@@ -6,6 +6,7 @@ from __future__ import annotations
 import json
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -79,27 +80,59 @@ def ensure_default_policy(path: Path = DEFAULT_POLICY_PATH) -> Path:
     return path
 
 
+@lru_cache(maxsize=8)
+def _load_policy_cached(path_str: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    return json.loads(Path(path_str).read_text(encoding="utf-8"))
+
+
 def load_policy(path: Path = DEFAULT_POLICY_PATH) -> dict[str, Any]:
     ensure_default_policy(path)
-    return json.loads(path.read_text(encoding="utf-8"))
+    # Keyed on mtime/size so edits are picked up; the returned dict is shared, treat it as read-only.
+    stat = path.stat()
+    return _load_policy_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@dataclass(frozen=True)
+class _CompiledTriggers:
+    tier_c_keywords: tuple[str, ...]
+    tier_c_patterns: tuple[tuple[str, re.Pattern[str]], ...]
+    tier_a_keywords: tuple[str, ...]
+
+
+# id(triggers) -> (triggers, compiled). Holding the triggers dict keeps its id from being reused.
+_COMPILED_TRIGGERS: dict[int, tuple[dict[str, Any], _CompiledTriggers]] = {}
+_COMPILED_TRIGGERS_MAX = 8
+_NO_TRIGGERS: dict[str, Any] = {}
+
+
+def _compiled_triggers(triggers: dict[str, Any]) -> _CompiledTriggers:
+    cached = _COMPILED_TRIGGERS.get(id(triggers))
+    if cached is not None and cached[0] is triggers:
+        return cached[1]
+    compiled = _CompiledTriggers(
+        tier_c_keywords=tuple(k.lower() for k in triggers.get("tier_c_keywords", []) if k),
+        tier_c_patterns=tuple((p, re.compile(p)) for p in triggers.get("tier_c_patterns", [])),
+        tier_a_keywords=tuple(k.lower() for k in triggers.get("tier_a_keywords", [])),
+    )
+    if len(_COMPILED_TRIGGERS) >= _COMPILED_TRIGGERS_MAX:
+        _COMPILED_TRIGGERS.clear()
+    _COMPILED_TRIGGERS[id(triggers)] = (triggers, compiled)
+    return compiled
 
 
 def classify_text(text: str, policy: dict[str, Any]) -> PolicyDecision:
     lowered = text.lower()
-    triggers = policy.get("triggers", {})
-    tier_c_keywords = [k.lower() for k in triggers.get("tier_c_keywords", [])]
-    tier_c_patterns = triggers.get("tier_c_patterns", [])
-    tier_a_keywords = [k.lower() for k in triggers.get("tier_a_keywords", [])]
+    triggers = _compiled_triggers(policy.get("triggers") or _NO_TRIGGERS)
 
-    for keyword in tier_c_keywords:
-        if keyword and keyword in lowered:
+    for keyword in triggers.tier_c_keywords:
+        if keyword in lowered:
             return PolicyDecision("C", False, f"tier_c_keyword:{keyword}")
 
-    for pattern in tier_c_patterns:
-        if re.search(pattern, text):
+    for pattern, compiled in triggers.tier_c_patterns:
+        if compiled.search(text):
             return PolicyDecision("C", False, f"tier_c_pattern:{pattern}")
 
-    if any(keyword in lowered for keyword in tier_a_keywords):
+    if any(keyword in lowered for keyword in triggers.tier_a_keywords):
         return PolicyDecision("A", True, "tier_a_ack_scheduling")
 
     return PolicyDecision("B", True, "tier_b_safe_operational_default")
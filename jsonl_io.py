@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Shared JSONL read/write helpers for the file-based pipeline."""
+
+from __future__ import annotations
+
+import json
+import os
+from hashlib import sha1
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_SIGNATURE_BYTES = 256
+
+
+def _dumps(row: dict[str, Any]) -> bytes:
+    if orjson is None:
+        return json.dumps(row, separators=(",", ":")).encode("utf-8")
+    return orjson.dumps(row, option=orjson.OPT_NON_STR_KEYS)
+
+
+def loads(line: bytes | str) -> Any:
+    if orjson is None:
+        return json.loads(line)
+    return orjson.loads(line)
+
+
+def read_rows_since(path: Path, offset: int = 0, skip_invalid: bool = False) -> tuple[list[dict[str, Any]], int]:
+    # Parse complete lines after byte offset; returns the rows and the offset to resume from.
+    if not path.exists():
+        return [], 0
+    with path.open("rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    rows: list[dict[str, Any]] = []
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            parsed = loads(line)
+        except ValueError:
+            if skip_invalid:
+                continue
+            raise
+        if isinstance(parsed, dict):
+            rows.append(parsed)
+    return rows, offset + end
+
+
+def start_signature(path: Path, offset: int) -> str:
+    # sha1 of the already-consumed prefix (first 256 bytes at most). Appends leave it alone;
+    # a file rewritten in place on the same inode changes it.
+    with path.open("rb") as f:
+        return sha1(f.read(min(_SIGNATURE_BYTES, max(0, offset)))).hexdigest()
+
+
+def _encode_rows(rows: Iterable[dict[str, Any]]) -> bytearray:
+    buf = bytearray()
+    for row in rows:
+        buf += _dumps(row)
+        buf += b"\n"
+    return buf
+
+
+def append_rows(path: Path, rows: Iterable[dict[str, Any]]) -> None:
+    buf = _encode_rows(rows)
+    if not buf:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Raw O_APPEND fd: the whole batch goes down in one write, no buffered-file copy.
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(buf)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def append_row(path: Path, row: dict[str, Any]) -> None:
+    append_rows(path, (row,))
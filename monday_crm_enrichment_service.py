@@ -10,6 +10,7 @@ import urllib.error
 import urllib.request
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any
@@ -67,24 +68,24 @@ def _company_from_domain(domain: str) -> str:
     return " ".join(part.capitalize() for part in root.split())
 
 
+@lru_cache(maxsize=8)
+def _parse_board_ids(raw: str) -> tuple[int, ...]:
+    return tuple(int(token) for token in (t.strip() for t in raw.split(",")) if token.isdigit())
+
+
 def configured_board_ids() -> list[int]:
-    board_ids: list[int] = []
-    for token in str(MONDAY_BOARD_IDS).split(","):
-        cleaned = token.strip()
-        if not cleaned:
-            continue
-        if cleaned.isdigit():
-            board_ids.append(int(cleaned))
-    return board_ids
+    # Keyed on the raw setting so the parse runs once per distinct value.
+    return list(_parse_board_ids(str(MONDAY_BOARD_IDS)))
 
 
 def _build_board_summary_query(board_ids: list[int]) -> str:
-    id_list = ",".join(str(v) for v in board_ids)
-    return (
-        "query { boards(ids: ["
-        + id_list
-        + "]) { id name state items_page(limit: 5) { items { id name updated_at } } } }"
-    )
+    return _board_summary_query(tuple(board_ids))
+
+
+@lru_cache(maxsize=32)
+def _board_summary_query(board_ids: tuple[int, ...]) -> str:
+    id_list = ",".join(map(str, board_ids))
+    return f"query {{ boards(ids: [{id_list}]) {{ id name state items_page(limit: 5) {{ items {{ id name updated_at }} }} }} }}"
 
 
 def _monday_graphql(query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
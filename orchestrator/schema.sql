@@ -61,6 +61,7 @@ create table if not exists publish_queue (
     dispatch_attempts integer not null default 0,
     dispatched_at timestamptz null,
     last_error text null,
+    next_attempt_at timestamptz null,
     created_at timestamptz not null
 );
 
@@ -68,10 +69,17 @@ alter table publish_queue add column if not exists dispatch_status text not null
 alter table publish_queue add column if not exists dispatch_attempts integer not null default 0;
 alter table publish_queue add column if not exists dispatched_at timestamptz null;
 alter table publish_queue add column if not exists last_error text null;
+alter table publish_queue add column if not exists next_attempt_at timestamptz null;
 
 create index if not exists idx_publish_queue_dispatch_status_created_at
     on publish_queue(dispatch_status, created_at);
 
+-- Claim path: only queued rows, ordered by when they are next due.
+-- On a large live table, pre-create this with CREATE INDEX CONCURRENTLY.
+create index if not exists idx_publish_queue_queued_ready
+    on publish_queue((coalesce(next_attempt_at, created_at)))
+    where dispatch_status = 'queued';
+
 create table if not exists swarm_jobs (
     job_id text primary key,
     work_order_id text not null unique,
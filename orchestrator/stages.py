@@ -17,7 +17,7 @@ from pipeline_daemon import (
 from .models import StageResult
 
 
-@dataclass
+@dataclass(slots=True)
 class StageContext:
     work_order: dict[str, Any]
     state: dict[str, Any] = field(default_factory=dict)
@@ -2,16 +2,31 @@ from __future__ import annotations
 
 import json
 import uuid
+from collections import deque
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Protocol
+from typing import TYPE_CHECKING, Any, NamedTuple, Protocol
 
 from .models import StageResult, WorkflowRun, utc_now_iso
 
 SCHEMA_PATH = Path(__file__).with_name("schema.sql")
+# NOTIFY channel raised when a publish_queue row is written; dispatchers LISTEN to wake early.
+PUBLISH_QUEUE_CHANNEL = "publish_queue_new"
 
 if TYPE_CHECKING:
     import psycopg
 
+_psycopg: Any = None
+
+
+def _load_psycopg() -> Any:
+    # Resolve the driver once; later connects skip the import machinery.
+    global _psycopg
+    if _psycopg is None:
+        import psycopg as psycopg_module
+
+        _psycopg = psycopg_module
+    return _psycopg
+
 
 class RunStore(Protocol):
     def start_run(self, work_order_id: str) -> WorkflowRun: ...
@@ -22,12 +37,31 @@ class RunStore(Protocol):
 
     def finish_run(self, run_id: str, status: str, current_stage: str) -> None: ...
 
+    def finalize_run(
+        self,
+        run_id: str,
+        work_order_id: str,
+        results: list[StageResult],
+        status: str,
+        current_stage: str,
+    ) -> None: ...
+
+
+class Event(NamedTuple):
+    run_id: str
+    stage: str
+    status: str
+    needs_human_review: bool
+    payload: dict[str, Any]
+    created_at: str
+
 
 class InMemoryRunStore:
-    def __init__(self) -> None:
+    def __init__(self, max_records: int | None = 10_000) -> None:
         self.runs: dict[str, WorkflowRun] = {}
-        self.events: list[dict[str, Any]] = []
-        self.artifacts: list[dict[str, Any]] = []
+        # Ring buffers so long-running dry-run loops keep flat memory; None keeps everything.
+        self.events: deque[Event] = deque(maxlen=max_records)
+        self.artifacts: deque[dict[str, Any]] = deque(maxlen=max_records)
 
     def start_run(self, work_order_id: str) -> WorkflowRun:
         run_id = f"run_{uuid.uuid4().hex[:12]}"
@@ -42,14 +76,7 @@ class InMemoryRunStore:
 
     def append_event(self, run_id: str, result: StageResult) -> None:
         self.events.append(
-            {
-                "run_id": run_id,
-                "stage": result.stage,
-                "status": result.status,
-                "needs_human_review": result.needs_human_review,
-                "payload": result.payload,
-                "created_at": result.created_at,
-            }
+            Event(run_id, result.stage, result.status, result.needs_human_review, result.payload, result.created_at)
         )
 
     def persist_artifact(self, run_id: str, work_order_id: str, result: StageResult) -> None:
@@ -69,6 +96,19 @@ class InMemoryRunStore:
         run.current_stage = current_stage
         run.updated_at = utc_now_iso()
 
+    def finalize_run(
+        self,
+        run_id: str,
+        work_order_id: str,
+        results: list[StageResult],
+        status: str,
+        current_stage: str,
+    ) -> None:
+        for result in results:
+            self.append_event(run_id, result)
+            self.persist_artifact(run_id, work_order_id, result)
+        self.finish_run(run_id, status=status, current_stage=current_stage)
+
 
 class PostgresRunStore:
     def __init__(self, database_url: str) -> None:
@@ -77,9 +117,7 @@ class PostgresRunStore:
         self.database_url = database_url
 
     def _connect(self) -> "psycopg.Connection":
-        import psycopg
-
-        return psycopg.connect(self.database_url)
+        return _load_psycopg().connect(self.database_url)
 
     def ensure_schema(self) -> None:
         schema_sql = SCHEMA_PATH.read_text(encoding="utf-8")
@@ -142,7 +180,8 @@ class PostgresRunStore:
         if not artifact_table:
             return
         with self._connect() as conn:
-            with conn.cursor() as cur:
+            # Pipelined so the publish_queue insert and its notify share one round-trip.
+            with conn.pipeline(), conn.cursor() as cur:
                 cur.execute(
                     f"""
                     insert into {artifact_table}(run_id, work_order_id, payload, created_at)
@@ -155,6 +194,8 @@ class PostgresRunStore:
                         result.created_at,
                     ),
                 )
+                if artifact_table == "publish_queue":
+                    cur.execute("select pg_notify(%s, %s)", (PUBLISH_QUEUE_CHANNEL, work_order_id))
             conn.commit()
 
     def finish_run(self, run_id: str, status: str, current_stage: str) -> None:
@@ -172,6 +213,64 @@ class PostgresRunStore:
                 )
             conn.commit()
 
+    def finalize_run(
+        self,
+        run_id: str,
+        work_order_id: str,
+        results: list[StageResult],
+        status: str,
+        current_stage: str,
+    ) -> None:
+        # Events, artifacts and the final run status land in one transaction instead of
+        # two commits per stage plus one for finish_run.
+        artifact_rows: dict[str, list[tuple[Any, ...]]] = {}
+        for result in results:
+            artifact_table = _artifact_table_for_stage(result.stage)
+            if artifact_table:
+                artifact_rows.setdefault(artifact_table, []).append(
+                    (run_id, work_order_id, json.dumps(result.payload, separators=(",", ":")), result.created_at)
+                )
+        with self._connect() as conn:
+            with conn.cursor() as cur:
+                cur.executemany(
+                    """
+                    insert into workflow_events(run_id, stage, status, needs_human_review, payload, created_at)
+                    values (%s, %s, %s, %s, %s::jsonb, %s)
+                    """,
+                    [
+                        (
+                            run_id,
+                            result.stage,
+                            result.status,
+                            result.needs_human_review,
+                            json.dumps(result.payload, separators=(",", ":")),
+                            result.created_at,
+                        )
+                        for result in results
+                    ],
+                )
+                for artifact_table, rows in artifact_rows.items():
+                    cur.executemany(
+                        f"""
+                        insert into {artifact_table}(run_id, work_order_id, payload, created_at)
+                        values (%s, %s, %s::jsonb, %s)
+                        """,
+                        rows,
+                    )
+                if "publish_queue" in artifact_rows:
+                    cur.execute("select pg_notify(%s, %s)", (PUBLISH_QUEUE_CHANNEL, work_order_id))
+                cur.execute(
+                    """
+                    update workflow_runs
+                    set status = %s,
+                        current_stage = %s,
+                        updated_at = %s
+                    where run_id = %s
+                    """,
+                    (status, current_stage, utc_now_iso(), run_id),
+                )
+            conn.commit()
+
 
 def _artifact_table_for_stage(stage: str) -> str:
     return {
@@ -7,16 +7,20 @@ import argparse
 import json
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
-
-import requests
+from typing import TYPE_CHECKING, Any
 
 from escalation_policy import classify_text, load_policy
+from jsonl_io import append_row, append_rows, loads, read_rows_since, start_signature
 from precedent_memory import lookup_precedent
 
+if TYPE_CHECKING:
+    import requests
+
 INTAKE_STATE_DIR = Path(os.environ.get("INTAKE_STATE_DIR", "/home/jacob/intake_state"))
 ACTIONABLE_PATH = INTAKE_STATE_DIR / "actionable_work_orders.jsonl"
 PIPELINE_DIR = Path(os.environ.get("PIPELINE_DIR", "/home/jacob/pipeline_out"))
@@ -26,31 +30,35 @@ OPENAI_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4.1-mini")
 OPENAI_TIMEOUT_SECONDS = int(os.environ.get("OPENAI_TIMEOUT_SECONDS", "25"))
 DRAFT_MIN_CONFIDENCE = float(os.environ.get("DRAFT_MIN_CONFIDENCE", "0.65"))
 AUTO_SEND_ENABLED = os.environ.get("AUTO_SEND_ENABLED", "true").strip().lower() in {"1", "true", "yes", "on"}
+PIPELINE_WORKERS = max(1, int(os.environ.get("PIPELINE_WORKERS", "4")))
 SIGNATURE_BLOCK = os.environ.get("SIGNATURE_BLOCK", "Best,\nYaakov\nyaakov@tapdash.co")
+OPENAI_URL = "https://api.openai.com/v1/chat/completions"
 
+# Shared keep-alive session so consecutive drafts reuse the TLS connection to OpenAI.
+_OPENAI_SESSION: requests.Session | None = None
+_OPENAI_SESSION_LOCK = threading.Lock()
 
-def _now() -> str:
-    return datetime.now(tz=timezone.utc).isoformat()
 
+def _openai_session() -> requests.Session:
+    # Built on first use so importing the daemon (tests, template-only runs) skips requests/urllib3.
+    global _OPENAI_SESSION
+    with _OPENAI_SESSION_LOCK:
+        if _OPENAI_SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
 
-def _read_jsonl(path: Path) -> list[dict[str, Any]]:
-    if not path.exists():
-        return []
-    rows: list[dict[str, Any]] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        parsed = json.loads(line)
-        if isinstance(parsed, dict):
-            rows.append(parsed)
-    return rows
+            session = requests.Session()
+            session.mount(
+                "https://",
+                HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.2)),
+            )
+            _OPENAI_SESSION = session
+    return _OPENAI_SESSION
 
 
-def _append_jsonl(path: Path, row: dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(row, separators=(",", ":")) + "\n")
+def _now() -> str:
+    return datetime.now(tz=timezone.utc).isoformat()
 
 
 def _load_state() -> dict[str, Any]:
@@ -164,38 +172,44 @@ def _enforce_exact_signature(body: str) -> str:
     return f"{text}\n\n{SIGNATURE_BLOCK}"
 
 
+_GENERIC_PHRASES = (
+    "thanks for reaching out",
+    "we received your message",
+    "can help with next steps",
+    "route this to the right team",
+)
+_ACTIONABLE_MARKERS = (
+    "please share",
+    "please send",
+    "reply with",
+    "can you",
+    "could you",
+    "let me know",
+    "confirm",
+    "book",
+    "schedule",
+)
+# One alternation scan for every CTA marker (plus a bare "?") instead of a pass per marker.
+_ACTIONABLE_CTA_RE = re.compile("|".join([*map(re.escape, _ACTIONABLE_MARKERS), r"\?"]))
+_SENDER_TOKEN_RE = re.compile(r"[a-z0-9]{4,}")
+_SUBJECT_TOKEN_RE = re.compile(r"[a-z0-9]{5,}")
+_SENDER_STOP_TOKENS = frozenset({"gmail", "yahoo", "outlook"})
+_SUBJECT_STOP_TOKENS = frozenset({"regarding", "meeting", "question", "request", "follow", "followup", "fwd"})
+
+
 def quality_gate_agent(work_order: dict[str, Any], draft_body: str) -> dict[str, Any]:
     body_lower = draft_body.lower()
-    generic_phrases = (
-        "thanks for reaching out",
-        "we received your message",
-        "can help with next steps",
-        "route this to the right team",
-    )
-    generic_phrase_hits = [phrase for phrase in generic_phrases if phrase in body_lower]
+    generic_phrase_hits = [phrase for phrase in _GENERIC_PHRASES if phrase in body_lower]
     generic_fluff = len(generic_phrase_hits) >= 2
 
-    actionable_markers = (
-        "please share",
-        "please send",
-        "reply with",
-        "can you",
-        "could you",
-        "let me know",
-        "confirm",
-        "book",
-        "schedule",
-    )
-    has_actionable_cta = any(marker in body_lower for marker in actionable_markers) or "?" in draft_body
+    has_actionable_cta = _ACTIONABLE_CTA_RE.search(body_lower) is not None
     missing_actionable_cta = not has_actionable_cta
 
     sender = str(work_order.get("sender", "")).strip().lower()
-    personalized_tokens = {token for token in re.findall(r"[a-z0-9]{4,}", sender) if token not in {"gmail", "yahoo", "outlook"}}
+    personalized_tokens = {token for token in _SENDER_TOKEN_RE.findall(sender) if token not in _SENDER_STOP_TOKENS}
     subject = str(work_order.get("subject", "")).strip().lower()
     personalized_tokens.update(
-        token
-        for token in re.findall(r"[a-z0-9]{5,}", subject)
-        if token not in {"regarding", "meeting", "question", "request", "follow", "followup", "fwd"}
+        token for token in _SUBJECT_TOKEN_RE.findall(subject) if token not in _SUBJECT_STOP_TOKENS
     )
     weak_personalization = bool(personalized_tokens) and not any(token in body_lower for token in personalized_tokens)
 
@@ -277,8 +291,8 @@ def _openai_draft(work_order: dict[str, Any], context: dict[str, Any], policy_ti
             },
         },
     }
-    response = requests.post(
-        "https://api.openai.com/v1/chat/completions",
+    response = _openai_session().post(
+        OPENAI_URL,
         headers={
             "Authorization": f"Bearer {OPENAI_API_KEY}",
             "Content-Type": "application/json",
@@ -295,7 +309,9 @@ def _openai_draft(work_order: dict[str, Any], context: dict[str, Any], policy_ti
     raw_content = _extract_json_string(message.get("content", ""))
     if not raw_content:
         raise RuntimeError("No completion content returned by OpenAI.")
-    draft_json = json.loads(raw_content)
+    draft_json = loads(raw_content)
+    if not isinstance(draft_json, dict):
+        raise RuntimeError("OpenAI draft content is not a JSON object.")
     draft_subject = str(draft_json.get("draft_subject") or f"Re: {subject}")
     draft_body = _enforce_exact_signature(str(draft_json.get("draft_body") or ""))
     if not draft_body.strip():
@@ -499,12 +515,24 @@ def publish_agent(
     return publish_row
 
 
-def process_work_order(work_order: dict[str, Any], policy: dict[str, Any]) -> dict[str, Any]:
+def _write_row(sinks: dict[str, list[dict[str, Any]]] | None, name: str, row: dict[str, Any]) -> None:
+    # Buffer into the caller's sinks when batching; otherwise append straight to the file.
+    if sinks is None:
+        append_row(PIPELINE_DIR / name, row)
+    else:
+        sinks.setdefault(name, []).append(row)
+
+
+def process_work_order(
+    work_order: dict[str, Any],
+    policy: dict[str, Any],
+    sinks: dict[str, list[dict[str, Any]]] | None = None,
+) -> dict[str, Any]:
     PIPELINE_DIR.mkdir(parents=True, exist_ok=True)
     wo_id = str(work_order.get("id"))
 
     context = context_agent(work_order)
-    _append_jsonl(PIPELINE_DIR / "context_packs.jsonl", context)
+    _write_row(sinks, "context_packs.jsonl", context)
 
     decision = classify_text(
         f"{work_order.get('subject','')} {work_order.get('sender','')}",
@@ -524,17 +552,17 @@ def process_work_order(work_order: dict[str, Any], policy: dict[str, Any]) -> di
     ):
         if key in work_order:
             draft[key] = work_order.get(key)
-    _append_jsonl(PIPELINE_DIR / "drafts.jsonl", draft)
+    _write_row(sinks, "drafts.jsonl", draft)
 
     tone_checked = tone_agent(draft)
-    _append_jsonl(PIPELINE_DIR / "tone_checked.jsonl", tone_checked)
+    _write_row(sinks, "tone_checked.jsonl", tone_checked)
 
     fact_checked = fact_agent(
         draft=tone_checked,
         decision_tier=decision.tier,
         wo_id=wo_id,
     )
-    _append_jsonl(PIPELINE_DIR / "fact_checked.jsonl", fact_checked)
+    _write_row(sinks, "fact_checked.jsonl", fact_checked)
 
     qa_result = qa_agent(
         work_order=work_order,
@@ -542,7 +570,7 @@ def process_work_order(work_order: dict[str, Any], policy: dict[str, Any]) -> di
         tone_checked=tone_checked,
         fact_checked=fact_checked,
     )
-    _append_jsonl(PIPELINE_DIR / "qa_results.jsonl", qa_result)
+    _write_row(sinks, "qa_results.jsonl", qa_result)
 
     policy_result = policy_agent(
         work_order=work_order,
@@ -566,7 +594,7 @@ def process_work_order(work_order: dict[str, Any], policy: dict[str, Any]) -> di
             ],
         }
     )
-    _append_jsonl(PIPELINE_DIR / "escalations.jsonl", escalation_row)
+    _write_row(sinks, "escalations.jsonl", escalation_row)
 
     publish_row = publish_agent(
         work_order=work_order,
@@ -577,7 +605,7 @@ def process_work_order(work_order: dict[str, Any], policy: dict[str, Any]) -> di
         policy_result=policy_result,
     )
     if publish_row:
-        _append_jsonl(PIPELINE_DIR / "draft_publish_payloads.jsonl", publish_row)
+        _write_row(sinks, "draft_publish_payloads.jsonl", publish_row)
 
     return {
         "work_order_id": wo_id,
@@ -586,27 +614,74 @@ def process_work_order(work_order: dict[str, Any], policy: dict[str, Any]) -> di
     }
 
 
+def _process_buffered(work_order: dict[str, Any], policy: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
+    sinks: dict[str, list[dict[str, Any]]] = {}
+    process_work_order(work_order=work_order, policy=policy, sinks=sinks)
+    return sinks
+
+
 def run_once(actionable_path: Path = ACTIONABLE_PATH) -> int:
-    policy = load_policy()
     state = _load_state()
     processed_ids = set(str(x) for x in state.get("processed_work_order_ids", []))
-    processed_now = 0
+    pending: list[dict[str, Any]] = []
+
+    # Resume from the last byte offset; an unchanged file costs one stat. A replaced,
+    # truncated or rewritten-in-place file is re-read from the start (processed ids dedupe it).
+    cursor = state.get("actionable_cursor") or {}
+    fingerprint: list[Any] | None = None
+    offset = 0
+    if actionable_path.exists():
+        st = actionable_path.stat()
+        fingerprint = [str(actionable_path), st.st_ino, st.st_size, st.st_mtime_ns]
+        previous = cursor.get("fingerprint") or []
+        if previous == fingerprint:
+            return 0
+        saved_offset = int(cursor.get("offset", 0))
+        if (
+            previous[:2] == fingerprint[:2]
+            and saved_offset <= st.st_size
+            and cursor.get("start_sig") == start_signature(actionable_path, saved_offset)
+        ):
+            offset = saved_offset
+    try:
+        records, offset = read_rows_since(actionable_path, offset)
+    except ValueError:
+        if not offset:
+            raise
+        # The resume point no longer falls on a line boundary; start over rather than wedge.
+        records, offset = read_rows_since(actionable_path, 0)
+    policy = load_policy()
 
-    for record in _read_jsonl(actionable_path):
+    for record in records:
         work_order = record.get("work_order") if isinstance(record, dict) else None
         if not isinstance(work_order, dict):
             continue
         wo_id = str(work_order.get("id", "")).strip()
         if not wo_id or wo_id in processed_ids:
             continue
-        process_work_order(work_order=work_order, policy=policy)
+        pending.append(work_order)
         processed_ids.add(wo_id)
-        processed_now += 1
 
+    # Work orders are independent (drafting is OpenAI-bound), so overlap them; map keeps input order.
+    sinks: dict[str, list[dict[str, Any]]] = {}
+    with ThreadPoolExecutor(max_workers=PIPELINE_WORKERS) as pool:
+        for order_sinks in pool.map(_process_buffered, pending, [policy] * len(pending)):
+            for name, rows in order_sinks.items():
+                sinks.setdefault(name, []).extend(rows)
+
+    # Sink rows for the whole pass are flushed once per file after processing.
+    for name, rows in sinks.items():
+        append_rows(PIPELINE_DIR / name, rows)
     state["processed_work_order_ids"] = sorted(processed_ids)
+    if fingerprint:
+        state["actionable_cursor"] = {
+            "fingerprint": fingerprint,
+            "offset": offset,
+            "start_sig": start_signature(actionable_path, offset),
+        }
     state["updated_at"] = _now()
     _save_state(state)
-    return processed_now
+    return len(pending)
 
 
 def run_loop(interval_seconds: int) -> None:
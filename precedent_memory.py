@@ -3,7 +3,9 @@
 
 from __future__ import annotations
 
+import fcntl
 import json
+import os
 from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -32,6 +34,40 @@ def _make_key(sender: str, labels: list[str], tier: str) -> str:
     return f"{domain}|{label_key}|{tier}"
 
 
+def _index_path(path: Path) -> Path:
+    return path.with_suffix(".idx.json")
+
+
+def _build_index(path: Path) -> dict[str, dict[str, int]]:
+    counts: dict[str, dict[str, int]] = {}
+    for row in _read_jsonl(path):
+        decisions = counts.setdefault(str(row.get("key", "")), {})
+        decision = str(row.get("decision", "unknown"))
+        decisions[decision] = decisions.get(decision, 0) + 1
+    return counts
+
+
+def _load_index(path: Path) -> dict[str, dict[str, int]] | None:
+    # The sidecar records the JSONL size it covers; any mismatch means it is stale.
+    try:
+        index = json.loads(_index_path(path).read_text(encoding="utf-8"))
+        if index.get("jsonl_size") != path.stat().st_size:
+            return None
+        return index["keys"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+
+
+def _save_index(path: Path, keys: dict[str, dict[str, int]]) -> None:
+    index_path = _index_path(path)
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"jsonl_size": path.stat().st_size, "keys": keys}, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, index_path)
+
+
 def append_precedent(
     sender: str,
     labels: list[str],
@@ -49,7 +85,16 @@ def append_precedent(
         "decision": decision,
     }
     with path.open("a", encoding="utf-8") as f:
+        # Serialise appenders so the JSONL and its count index move together.
+        fcntl.flock(f, fcntl.LOCK_EX)
+        keys = _load_index(path)
+        if keys is None:
+            keys = _build_index(path)
         f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        f.flush()
+        decisions = keys.setdefault(record["key"], {})
+        decisions[decision] = decisions.get(decision, 0) + 1
+        _save_index(path, keys)
 
 
 def _read_jsonl(path: Path) -> list[dict[str, Any]]:
@@ -75,16 +120,20 @@ def lookup_precedent(
     min_samples: int = 2,
 ) -> PrecedentMatch:
     key = _make_key(sender=sender, labels=labels, tier=tier)
-    rows = [row for row in _read_jsonl(path) if row.get("key") == key]
-    if not rows:
+    keys = _load_index(path)
+    if keys is None:
+        # No usable index (older files, manual edits): fall back to a full scan.
+        keys = _build_index(path)
+    counts = Counter(keys.get(key) or {})
+    total = sum(counts.values())
+    if not total:
         return PrecedentMatch(False, "unknown", 0.0, key, 0)
 
-    counts = Counter(str(row.get("decision", "unknown")) for row in rows)
     decision, count = counts.most_common(1)[0]
-    confidence = count / len(rows)
-    enough_samples = len(rows) >= min_samples
+    confidence = count / total
+    enough_samples = total >= min_samples
     high_confidence = confidence >= min_confidence
 
     if enough_samples and high_confidence:
-        return PrecedentMatch(True, decision, confidence, key, len(rows))
-    return PrecedentMatch(False, decision, confidence, key, len(rows))
+        return PrecedentMatch(True, decision, confidence, key, total)
+    return PrecedentMatch(False, decision, confidence, key, total)
@@ -11,6 +11,8 @@ from typing import Any
 
 import requests
 
+from jsonl_io import loads, start_signature
+
 PIPELINE_DIR = Path(os.environ.get("PIPELINE_DIR", "/home/jacob/pipeline_out"))
 STATE_PATH = PIPELINE_DIR / "publish_sender_state.json"
 PUBLISH_FILE = PIPELINE_DIR / "draft_publish_payloads.jsonl"
@@ -18,38 +20,53 @@ WEBHOOK_URL = os.environ.get("PUBLISH_WEBHOOK_URL", "").strip()
 INTERVAL_SECONDS = int(os.environ.get("PUBLISH_INTERVAL_SECONDS", "15"))
 
 
-def _load_state() -> set[str]:
+def _load_state() -> tuple[set[str], dict[str, Any]]:
+    # cursor: byte_offset into PUBLISH_FILE plus the inode and start_sig it was taken against.
+    cursor: dict[str, Any] = {"byte_offset": 0, "inode": 0, "start_sig": ""}
     if not STATE_PATH.exists():
-        return set()
+        return set(), cursor
     try:
         data = json.loads(STATE_PATH.read_text(encoding="utf-8"))
-        return set(str(x) for x in data.get("sent_ids", []))
+        cursor = {
+            "byte_offset": int(data.get("byte_offset", 0)),
+            "inode": int(data.get("inode", 0)),
+            "start_sig": str(data.get("start_sig", "")),
+        }
+        return set(str(x) for x in data.get("sent_ids", [])), cursor
     except Exception:
-        return set()
+        return set(), cursor
 
 
-def _save_state(sent_ids: set[str]) -> None:
+def _save_state(sent_ids: set[str], cursor: dict[str, Any]) -> None:
     STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    STATE_PATH.write_text(
-        json.dumps({"sent_ids": sorted(sent_ids)}, indent=2), encoding="utf-8"
-    )
+    STATE_PATH.write_text(json.dumps({"sent_ids": sorted(sent_ids), **cursor}, indent=2), encoding="utf-8")
 
 
-def _iter_jsonl(path: Path) -> list[dict[str, Any]]:
+def _read_new_lines(path: Path, cursor: dict[str, Any]) -> tuple[list[tuple[int, bytes]], int, int]:
+    # (start offset, line) for each complete line after the cursor, where the next read resumes,
+    # and the file's inode. A replaced, truncated or rewritten file restarts at 0.
     if not path.exists():
-        return []
-    rows: list[dict[str, Any]] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            parsed = json.loads(line)
-            if isinstance(parsed, dict):
-                rows.append(parsed)
-        except Exception:
-            continue
-    return rows
+        return [], 0, 0
+    st = path.stat()
+    offset = int(cursor.get("byte_offset", 0))
+    if (
+        st.st_ino != cursor.get("inode")
+        or st.st_size < offset
+        or cursor.get("start_sig") != start_signature(path, offset)
+    ):
+        offset = 0
+    with path.open("rb") as f:
+        f.seek(offset)
+        data = f.read()
+    lines: list[tuple[int, bytes]] = []
+    start = 0
+    while True:
+        end = data.find(b"\n", start)
+        if end < 0:
+            break
+        lines.append((offset + start, data[start:end]))
+        start = end + 1
+    return lines, offset + start, st.st_ino
 
 
 def send_payload(payload: dict[str, Any]) -> bool:
@@ -77,9 +94,17 @@ def _should_send(row: dict[str, Any]) -> bool:
 
 
 def process_once() -> int:
-    sent_ids = _load_state()
+    sent_ids, cursor = _load_state()
     count = 0
-    for row in _iter_jsonl(PUBLISH_FILE):
+    retry_from: int | None = None
+    lines, next_offset, inode = _read_new_lines(PUBLISH_FILE, cursor)
+    for line_start, line in lines:
+        try:
+            row = loads(line) if line.strip() else None
+        except ValueError:
+            row = None
+        if not isinstance(row, dict):
+            continue
         wo_id = str(row.get("work_order_id") or "").strip()
         if not wo_id or wo_id in sent_ids:
             continue
@@ -90,7 +115,17 @@ def process_once() -> int:
         if send_payload(row):
             sent_ids.add(wo_id)
             count += 1
-    _save_state(sent_ids)
+        elif retry_from is None:
+            # Keep the cursor at the first failed row so it is retried next tick.
+            retry_from = line_start
+    byte_offset = retry_from if retry_from is not None else next_offset
+    if inode:
+        cursor = {
+            "byte_offset": byte_offset,
+            "inode": inode,
+            "start_sig": start_signature(PUBLISH_FILE, byte_offset),
+        }
+    _save_state(sent_ids, cursor)
     return count
 
 
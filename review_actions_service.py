@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 from datetime import datetime, timezone
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
@@ -49,22 +50,108 @@ def _append_jsonl(path: Path, row: dict[str, Any]) -> None:
         f.write(json.dumps(row, separators=(",", ":")) + "\n")
 
 
+class _JsonlOffsetIndex:
+    """key -> byte offset of the latest row carrying it, extended from the tail as the file grows."""
+
+    def __init__(self, path: Path, key_field: str) -> None:
+        self.path = path
+        self.key_field = key_field
+        self.offsets: dict[str, int] = {}
+        self.inode = -1
+        self.indexed_to = 0
+
+    def _reset(self, inode: int = -1) -> None:
+        self.offsets, self.inode, self.indexed_to = {}, inode, 0
+
+    def _refresh(self) -> bool:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._reset()
+            return False
+        if stat.st_ino != self.inode or stat.st_size < self.indexed_to:
+            # Replaced or truncated: start over.
+            self._reset(stat.st_ino)
+        if stat.st_size == self.indexed_to:
+            return True
+        with self.path.open("rb") as f:
+            f.seek(self.indexed_to)
+            offset = self.indexed_to
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial row still being written; pick it up next time
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                if isinstance(row, dict):
+                    self.offsets[str(row.get(self.key_field, ""))] = offset
+                offset += len(line)
+            self.indexed_to = offset
+        return True
+
+    def _read_at(self, key: str) -> dict[str, Any] | None:
+        with self.path.open("rb") as f:
+            f.seek(self.offsets[key])
+            row = json.loads(f.readline())
+        if not isinstance(row, dict) or str(row.get(self.key_field, "")) != key:
+            raise ValueError(f"offset for {key!r} no longer points at its row")
+        return row
+
+    def _scan(self, key: str) -> dict[str, Any] | None:
+        latest = None
+        with self.path.open("rb") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(row, dict) and str(row.get(self.key_field, "")) == key:
+                    latest = row
+        return latest
+
+    def latest(self, key: str) -> dict[str, Any] | None:
+        for _ in range(2):
+            if not self._refresh() or key not in self.offsets:
+                return None
+            try:
+                return self._read_at(key)
+            except (FileNotFoundError, ValueError):
+                # The file changed between the refresh and the read; rebuild and try again.
+                self._reset()
+        # Still moving under us: answer from a plain scan; the index rebuilds on the next call.
+        try:
+            return self._scan(key)
+        except FileNotFoundError:
+            return None
+
+    def contains(self, key: str) -> bool:
+        return self._refresh() and key in self.offsets
+
+
+_OFFSET_INDEXES: dict[tuple[Path, str], _JsonlOffsetIndex] = {}
+_OFFSET_INDEX_LOCK = threading.Lock()
+
+
+def _latest_row(path: Path, key_field: str, key: str, *, exists_only: bool = False) -> Any:
+    # The service is threaded and the files are appended by other processes; one lock guards the indexes.
+    with _OFFSET_INDEX_LOCK:
+        index = _OFFSET_INDEXES.get((path, key_field))
+        if index is None:
+            index = _OFFSET_INDEXES[(path, key_field)] = _JsonlOffsetIndex(path, key_field)
+        return index.contains(key) if exists_only else index.latest(key)
+
+
 def _latest_by_work_order(path: Path, work_order_id: str) -> dict[str, Any] | None:
-    for row in reversed(_read_jsonl(path)):
-        if str(row.get("work_order_id", "")) == work_order_id:
-            return row
-    return None
+    return _latest_row(path, "work_order_id", work_order_id)
 
 
 def _work_order_for_id(work_order_id: str) -> dict[str, Any] | None:
-    for row in reversed(_read_jsonl(WORK_ORDER_STORE)):
-        if str(row.get("id", "")) == work_order_id:
-            return row
-    return None
+    return _latest_row(WORK_ORDER_STORE, "id", work_order_id)
 
 
 def _publish_exists(work_order_id: str) -> bool:
-    return any(str(row.get("work_order_id", "")) == work_order_id for row in _read_jsonl(PUBLISH_PATH))
+    return bool(_latest_row(PUBLISH_PATH, "work_order_id", work_order_id, exists_only=True))
 
 
 def _build_publish_payload(work_order_id: str, edited_body: str | None) -> dict[str, Any] | None:
@@ -4,13 +4,31 @@
 from __future__ import annotations
 
 import json
+import mmap
+import os
 from hashlib import sha1
 from pathlib import Path
-from typing import Any, Protocol
+from typing import Any, Iterator, Protocol
+
+from jsonl_io import loads
+
+
+def _iter_lines(mm: mmap.mmap, start: int) -> Iterator[bytes]:
+    # Non-blank lines from start to the end of the map; a trailing line without "\n" is included.
+    end = len(mm)
+    pos = start
+    while pos < end:
+        nl = mm.find(b"\n", pos)
+        if nl < 0:
+            nl = end
+        line = mm[pos:nl].strip()
+        pos = nl + 1
+        if line:
+            yield line
 
 
 class SwarmEnqueueQueue(Protocol):
-    def enqueue(self, work_order_id: str, payload: dict[str, Any]) -> str: ...
+    def enqueue_many(self, items: list[tuple[str, dict[str, Any]]]) -> list[str]: ...
 
 
 class ActionableSwarmIngestor:
@@ -18,34 +36,38 @@ class ActionableSwarmIngestor:
         self.queue = queue
         self.actionable_path = actionable_path
         self.state_path = state_path
+        # Last state written or read, so idle ticks neither re-read nor rewrite the file.
+        self._persisted: dict[str, Any] | None = None
 
     def _load_state(self) -> dict[str, Any]:
+        if self._persisted is not None:
+            return dict(self._persisted)
         if not self.state_path.exists():
             return {"offset": 0, "mtime_ns": 0, "start_sig": ""}
         try:
             payload = json.loads(self.state_path.read_text(encoding="utf-8"))
-            return {
+            self._persisted = {
                 "offset": int(payload.get("offset", 0)),
                 "mtime_ns": int(payload.get("mtime_ns", 0)),
                 "start_sig": str(payload.get("start_sig", "")),
             }
         except Exception:
             return {"offset": 0, "mtime_ns": 0, "start_sig": ""}
+        return dict(self._persisted)
 
     def _save_state(self, offset: int, mtime_ns: int, start_sig: str) -> None:
+        state = {
+            "offset": max(0, int(offset)),
+            "mtime_ns": max(0, int(mtime_ns)),
+            "start_sig": start_sig,
+        }
+        if state == self._persisted:
+            return
         self.state_path.parent.mkdir(parents=True, exist_ok=True)
-        self.state_path.write_text(
-            json.dumps(
-                {
-                    "offset": max(0, int(offset)),
-                    "mtime_ns": max(0, int(mtime_ns)),
-                    "start_sig": start_sig,
-                },
-                indent=2,
-                sort_keys=True,
-            ),
-            encoding="utf-8",
-        )
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
+        self._persisted = state
 
     @staticmethod
     def _extract_work_order(row: dict[str, Any]) -> dict[str, Any] | None:
@@ -63,51 +85,58 @@ class ActionableSwarmIngestor:
             "rows_enqueued": 0,
             "rows_skipped": 0,
         }
-        if not self.actionable_path.exists():
+        try:
+            stat = self.actionable_path.stat()
+        except FileNotFoundError:
             return stats
 
         state = self._load_state()
         offset = int(state.get("offset", 0))
         previous_mtime_ns = int(state.get("mtime_ns", 0))
         previous_start_sig = str(state.get("start_sig", ""))
-        stat = self.actionable_path.stat()
         file_size = stat.st_size
         mtime_ns = int(stat.st_mtime_ns)
+        if file_size == offset and mtime_ns == previous_mtime_ns:
+            # Idle poll: nothing appended or rewritten, so skip the signature read and the open.
+            return stats
         start_sig = self._start_signature()
         if offset > file_size or start_sig != previous_start_sig or (
             file_size <= offset and mtime_ns != previous_mtime_ns
         ):
             offset = 0
 
-        with self.actionable_path.open("r", encoding="utf-8") as f:
-            f.seek(offset)
-            chunk = f.read()
-            new_offset = f.tell()
-
-        if not chunk:
-            self._save_state(new_offset, mtime_ns=mtime_ns, start_sig=start_sig)
-            return stats
-
-        for line in chunk.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            stats["rows_read"] += 1
-            try:
-                row = json.loads(line)
-            except Exception:
-                stats["rows_skipped"] += 1
-                continue
-            if not isinstance(row, dict):
-                stats["rows_skipped"] += 1
-                continue
-            work_order = self._extract_work_order(row)
-            if not work_order:
-                stats["rows_skipped"] += 1
-                continue
-            work_order_id = str(work_order["id"])
-            self.queue.enqueue(work_order_id=work_order_id, payload=work_order)
-            stats["rows_enqueued"] += 1
+        with self.actionable_path.open("rb") as f:
+            # Size from the open descriptor: the file may have shrunk since the stat above,
+            # and mmap rejects an empty file.
+            if os.fstat(f.fileno()).st_size <= offset:
+                self._save_state(offset, mtime_ns=mtime_ns, start_sig=start_sig)
+                return stats
+            # Map the file and slice out one line at a time rather than copying the whole tail.
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        batch: list[tuple[str, dict[str, Any]]] = []
+        with mm:
+            new_offset = len(mm)
+            for line in _iter_lines(mm, offset):
+                stats["rows_read"] += 1
+                try:
+                    row = loads(line)
+                except Exception:
+                    stats["rows_skipped"] += 1
+                    continue
+                if not isinstance(row, dict):
+                    stats["rows_skipped"] += 1
+                    continue
+                work_order = self._extract_work_order(row)
+                if not work_order:
+                    stats["rows_skipped"] += 1
+                    continue
+                batch.append((str(work_order["id"]), work_order))
+
+        if batch:
+            # One enqueue call per tick instead of one per row.
+            self.queue.enqueue_many(batch)
+            stats["rows_enqueued"] = len(batch)
 
         self._save_state(new_offset, mtime_ns=mtime_ns, start_sig=start_sig)
         return stats
@@ -1,11 +1,12 @@
 """LangGraph swarm runtime for TapDash email orchestration."""
 
 from .graph import build_swarm_graph
-from .queue import InMemorySwarmJobQueue, PostgresSwarmJobQueue, SwarmJob
+from .queue import AsyncPostgresSwarmJobQueue, InMemorySwarmJobQueue, PostgresSwarmJobQueue, SwarmJob
 from .supervisor import SwarmSupervisor
 from .worker import SwarmWorker
 
 __all__ = [
+    "AsyncPostgresSwarmJobQueue",
     "build_swarm_graph",
     "InMemorySwarmJobQueue",
     "PostgresSwarmJobQueue",
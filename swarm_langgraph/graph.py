@@ -27,13 +27,13 @@ class FallbackSwarmGraph:
         ]
 
     def invoke(self, state: SwarmState) -> SwarmState:
-        current = dict(state)
+        # Node updates are applied in place on the slotted state; no per-run dict copy.
         for fn in self._order:
-            update = fn(current)  # type: ignore[arg-type]
-            current.update(update)
-            if current.get("halt"):
+            for key, value in fn(state).items():
+                setattr(state, key, value)
+            if state.halt:
                 break
-        return current  # type: ignore[return-value]
+        return state
 
 
 def build_swarm_graph(nodes: SwarmNodes | None = None) -> Any:
@@ -66,7 +66,7 @@ def build_swarm_graph(nodes: SwarmNodes | None = None) -> Any:
     graph.add_edge("qa_agent", "policy_agent")
 
     def route_after_policy(state: SwarmState) -> str:
-        if state.get("halt"):
+        if state.halt:
             return END
         return "publish_agent"
 
@@ -3,27 +3,36 @@ from __future__ import annotations
 import json
 import os
 import re
-import urllib.error
-import urllib.request
+import threading
 from datetime import datetime, timezone
-from typing import Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import requests
 
 MONDAY_API_URL = os.environ.get("MONDAY_API_URL", "https://api.monday.com/v2")
 MONDAY_API_TOKEN = os.environ.get("MONDAY_API_TOKEN", "").strip()
 MONDAY_BOARD_IDS = os.environ.get("MONDAY_BOARD_IDS") or os.environ.get("MONDAY_BOARD_ID") or "18397429943"
 
+_MONDAY_SESSION: requests.Session | None = None
+_MONDAY_SESSION_LOCK = threading.Lock()
+# requests.RequestException, captured when the session is built so calls need no import.
+_MONDAY_REQUEST_ERRORS: tuple[type[BaseException], ...] = ()
+
 
 def _now_iso() -> str:
     return datetime.now(tz=timezone.utc).isoformat()
 
 
+@lru_cache(maxsize=8)
+def _parse_board_ids(raw: str) -> tuple[int, ...]:
+    return tuple(int(token) for token in (t.strip() for t in raw.split(",")) if token.isdigit())
+
+
 def configured_board_ids() -> list[int]:
-    board_ids: list[int] = []
-    for token in str(MONDAY_BOARD_IDS).split(","):
-        token = token.strip()
-        if token.isdigit():
-            board_ids.append(int(token))
-    return board_ids
+    # Keyed on the raw setting so the parse runs once per distinct value.
+    return list(_parse_board_ids(str(MONDAY_BOARD_IDS)))
 
 
 def _email_domain(email: str) -> str:
@@ -32,29 +41,41 @@ def _email_domain(email: str) -> str:
     return email.rsplit("@", 1)[-1].lower().strip()
 
 
+def _monday_session() -> requests.Session:
+    # Built on first use; the boards query and the item-updates query then share one connection.
+    global _MONDAY_SESSION, _MONDAY_REQUEST_ERRORS
+    with _MONDAY_SESSION_LOCK:
+        if _MONDAY_SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            _MONDAY_REQUEST_ERRORS = (requests.RequestException,)
+
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+            session.headers.update({"Content-Type": "application/json", "User-Agent": "TapdashEmailSwarm/1.0"})
+            _MONDAY_SESSION = session
+    return _MONDAY_SESSION
+
+
 def _monday_graphql(query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
     if not MONDAY_API_TOKEN:
         raise RuntimeError("MONDAY_API_TOKEN is not set")
 
     payload = {"query": query, "variables": variables or {}}
-    req = urllib.request.Request(
-        MONDAY_API_URL,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={
-            "Authorization": MONDAY_API_TOKEN,
-            "Content-Type": "application/json",
-            "User-Agent": "TapdashEmailSwarm/1.0",
-        },
-        method="POST",
-    )
+    session = _monday_session()
     try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            raw = resp.read().decode("utf-8")
-    except urllib.error.HTTPError as exc:
-        body = exc.read().decode("utf-8", errors="replace")
-        raise RuntimeError(f"Monday API HTTP {exc.code}: {body[:500]}") from exc
-    except urllib.error.URLError as exc:
-        raise RuntimeError(f"Monday API connection error: {exc.reason}") from exc
+        resp = session.post(
+            MONDAY_API_URL,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Authorization": MONDAY_API_TOKEN},
+            timeout=20,
+        )
+    except _MONDAY_REQUEST_ERRORS as exc:
+        raise RuntimeError(f"Monday API connection error: {exc}") from exc
+    raw = resp.content.decode("utf-8", errors="replace")
+    if resp.status_code >= 400:
+        raise RuntimeError(f"Monday API HTTP {resp.status_code}: {raw[:500]}")
 
     parsed = json.loads(raw)
     if parsed.get("errors"):
@@ -65,20 +86,37 @@ def _monday_graphql(query: str, variables: dict[str, Any] | None = None) -> dict
     return data
 
 
-def _boards_with_items_and_updates(board_ids: list[int]) -> list[dict[str, Any]]:
+def _boards_light(board_ids: list[int]) -> list[dict[str, Any]]:
+    # Updates are fetched separately, and only for the matched item.
     if not board_ids:
         return []
     query = (
         "query { boards(ids: ["
         + ",".join(str(v) for v in board_ids)
-        + "]) { id name items_page(limit: 50) { items { id name updated_at column_values { id text } updates(limit: 5) { id body created_at } } } } }"
+        + "]) { id name items_page(limit: 50) { items { id name updated_at column_values { id text } } } } }"
     )
     data = _monday_graphql(query)
     boards = data.get("boards")
     return boards if isinstance(boards, list) else []
 
 
-def _item_score(item: dict[str, Any], sender_email: str, sender_domain: str) -> tuple[int, list[str]]:
+def _item_updates(item_id: str) -> list[dict[str, Any]]:
+    query = "query ($ids: [ID!]) { items(ids: $ids) { id updates(limit: 5) { id body created_at } } }"
+    data = _monday_graphql(query, {"ids": [str(item_id)]})
+    items = data.get("items")
+    if not isinstance(items, list) or not items or not isinstance(items[0], dict):
+        return []
+    updates = items[0].get("updates")
+    return updates if isinstance(updates, list) else []
+
+
+def _item_score(
+    item: dict[str, Any],
+    sender_email: str,
+    sender_domain: str,
+    domain_root: str = "",
+) -> tuple[int, list[str]]:
+    # sender_email/sender_domain/domain_root arrive lowercased once per run.
     name = str(item.get("name", "")).lower()
     text_blob_parts = [name]
     for column in item.get("column_values") or []:
@@ -88,13 +126,12 @@ def _item_score(item: dict[str, Any], sender_email: str, sender_domain: str) ->
 
     score = 0
     reasons: list[str] = []
-    if sender_email and sender_email.lower() in blob:
+    if sender_email and sender_email in blob:
         score += 5
         reasons.append("matched_sender_email")
     if sender_domain and sender_domain in blob:
         score += 3
         reasons.append("matched_sender_domain")
-    domain_root = sender_domain.split(".", 1)[0] if sender_domain else ""
     if domain_root and domain_root in blob:
         score += 2
         reasons.append("matched_company_root")
@@ -105,7 +142,9 @@ def _item_score(item: dict[str, Any], sender_email: str, sender_domain: str) ->
 
 
 def monday_contact_subagent(sender_email: str, boards: list[dict[str, Any]]) -> dict[str, Any]:
-    sender_domain = _email_domain(sender_email)
+    sender_email_lc = sender_email.strip().lower()
+    sender_domain = _email_domain(sender_email_lc)
+    domain_root = sender_domain.split(".", 1)[0] if sender_domain else ""
     best_item: dict[str, Any] | None = None
     best_board: dict[str, Any] | None = None
     best_score = 0
@@ -116,7 +155,12 @@ def monday_contact_subagent(sender_email: str, boards: list[dict[str, Any]]) ->
         for item in items:
             if not isinstance(item, dict):
                 continue
-            score, reasons = _item_score(item, sender_email=sender_email, sender_domain=sender_domain)
+            score, reasons = _item_score(
+                item,
+                sender_email=sender_email_lc,
+                sender_domain=sender_domain,
+                domain_root=domain_root,
+            )
             if score > best_score:
                 best_score = score
                 best_item = item
@@ -203,8 +247,11 @@ def monday_coordinator_agent(work_order: dict[str, Any]) -> dict[str, Any]:
         return response
 
     try:
-        boards = _boards_with_items_and_updates(board_ids)
+        boards = _boards_light(board_ids)
         contact = monday_contact_subagent(sender_email=sender_email, boards=boards)
+        matched_item = contact.get("matched_item")
+        if isinstance(matched_item, dict) and matched_item.get("id"):
+            contact["matched_item"] = {**matched_item, "updates": _item_updates(str(matched_item["id"]))}
         deal = monday_deal_subagent(contact)
         updates = monday_updates_subagent(contact)
         score = int(contact.get("match_score", 0))
@@ -18,6 +18,21 @@ from .monday_agents import monday_coordinator_agent
 from .state import SwarmState
 
 
+def _context_obj(state: dict[str, Any]) -> dict[str, Any] | None:
+    # state["context"]["context"], created on demand; None when an outer level is not a dict.
+    base_context = state.get("context")
+    if not isinstance(base_context, dict):
+        return None
+    context_obj = base_context.setdefault("context", {})
+    return context_obj if isinstance(context_obj, dict) else None
+
+
+def _set_external_context(context_obj: dict[str, Any], source: str, value: dict[str, Any]) -> None:
+    external_context = context_obj.setdefault("external_context", {})
+    if isinstance(external_context, dict):
+        external_context[source] = value
+
+
 class SwarmNodes:
     """Specialist swarm nodes with deterministic handoff order."""
 
@@ -32,72 +47,67 @@ class SwarmNodes:
         self._publish = PublishStage()
 
     def tier_agent(self, state: SwarmState) -> dict[str, Any]:
-        result = self._tier.run(state["ctx"])
+        result = self._tier.run(state.ctx)
         return {"last_result": result}
 
     def context_agent(self, state: SwarmState) -> dict[str, Any]:
-        result = self._context.run(state["ctx"])
+        result = self._context.run(state.ctx)
         return {"last_result": result}
 
     def monday_coordinator_agent(self, state: SwarmState) -> dict[str, Any]:
-        ctx = state["ctx"]
+        ctx = state.ctx
         monday_context = monday_coordinator_agent(ctx.work_order)
         ctx.state["monday_context"] = monday_context
 
-        base_context = ctx.state.get("context")
-        if isinstance(base_context, dict):
-            context_obj = base_context.setdefault("context", {})
-            if isinstance(context_obj, dict):
-                crm_enriched_fields = context_obj.setdefault("crm_enriched_fields", {})
-                if isinstance(crm_enriched_fields, dict):
-                    crm_enriched_fields.update(monday_context.get("crm_context", {}))
-                context_obj["monday_swarm"] = monday_context
-                external_context = context_obj.setdefault("external_context", {})
-                if isinstance(external_context, dict):
-                    external_context["monday"] = monday_context
+        context_obj = _context_obj(ctx.state)
+        if context_obj is not None:
+            crm_enriched_fields = context_obj.get("crm_enriched_fields")
+            if crm_enriched_fields is None:
+                crm_enriched_fields = context_obj["crm_enriched_fields"] = {}
+            if isinstance(crm_enriched_fields, dict):
+                # The context stage builds this dict per run, so merging in place is safe.
+                crm_enriched_fields.update(monday_context.get("crm_context") or {})
+            context_obj["monday_swarm"] = monday_context
+            _set_external_context(context_obj, "monday", monday_context)
         return {"last_result": None}
 
     def graph_coordinator_agent(self, state: SwarmState) -> dict[str, Any]:
-        ctx = state["ctx"]
+        ctx = state.ctx
         graph_context = graph_coordinator_agent(ctx.work_order)
         ctx.state["graph_context"] = graph_context
 
-        base_context = ctx.state.get("context")
-        if isinstance(base_context, dict):
-            context_obj = base_context.setdefault("context", {})
-            if isinstance(context_obj, dict):
-                context_obj["graph_thread"] = graph_context
-                external_context = context_obj.setdefault("external_context", {})
-                if isinstance(external_context, dict):
-                    external_context["graph"] = graph_context
+        context_obj = _context_obj(ctx.state)
+        if context_obj is not None:
+            context_obj["graph_thread"] = graph_context
+            _set_external_context(context_obj, "graph", graph_context)
         return {"last_result": None}
 
     def draft_agent(self, state: SwarmState) -> dict[str, Any]:
-        result = self._draft.run(state["ctx"])
+        result = self._draft.run(state.ctx)
         return {"last_result": result}
 
     def tone_agent(self, state: SwarmState) -> dict[str, Any]:
-        result = self._tone.run(state["ctx"])
+        result = self._tone.run(state.ctx)
         return {"last_result": result}
 
     def fact_agent(self, state: SwarmState) -> dict[str, Any]:
-        result = self._fact.run(state["ctx"])
+        result = self._fact.run(state.ctx)
         return {"last_result": result}
 
     def qa_agent(self, state: SwarmState) -> dict[str, Any]:
-        result = self._qa.run(state["ctx"])
+        result = self._qa.run(state.ctx)
         return {"last_result": result}
 
     def policy_agent(self, state: SwarmState) -> dict[str, Any]:
-        result = self._policy.run(state["ctx"])
+        result = self._policy.run(state.ctx)
         halt = bool(result.needs_human_review)
         run_status = "needs_human_review" if halt else "running"
         return {"last_result": result, "halt": halt, "run_status": run_status}
 
     def publish_agent(self, state: SwarmState) -> dict[str, Any]:
-        result = self._publish.run(state["ctx"])
+        result = self._publish.run(state.ctx)
         return {
             "last_result": result,
-            "output": {"publish": state["ctx"].state.get("publish")},
-            "run_status": state.get("run_status", "completed"),
+            "output": {"publish": state.ctx.state.get("publish")},
+            "run_status": state.run_status,
         }
@@ -2,13 +2,19 @@ from __future__ import annotations
 
 import json
 import uuid
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Any
 
+from orchestrator.store import _load_psycopg
+
 if TYPE_CHECKING:
     import psycopg
 
+# NOTIFY channel raised when a job is enqueued; workers LISTEN to wake early.
+SWARM_JOBS_CHANNEL = "swarm_jobs_new"
+
 
 def _now() -> datetime:
     return datetime.now(tz=timezone.utc)
@@ -22,7 +28,7 @@ def _next_backoff(attempt: int) -> timedelta:
     return timedelta(minutes=10)
 
 
-@dataclass
+@dataclass(slots=True)
 class SwarmJob:
     job_id: str
     work_order_id: str
@@ -35,74 +41,187 @@ class SwarmJob:
 class InMemorySwarmJobQueue:
     def __init__(self) -> None:
         self.jobs: list[SwarmJob] = []
+        # Side indexes so claim/mark/recover avoid scanning every job ever enqueued.
+        self._by_id: dict[str, SwarmJob] = {}
+        self._queued: deque[SwarmJob] = deque()
+        self._running: dict[str, SwarmJob] = {}
 
-    def enqueue(self, work_order_id: str, payload: dict[str, Any]) -> str:
-        job_id = f"job_{uuid.uuid4().hex[:10]}"
-        self.jobs.append(
-            SwarmJob(
-                job_id=job_id,
-                work_order_id=work_order_id,
-                payload=payload,
-                attempt=0,
-                status="queued",
-            )
+    def _add(self, work_order_id: str, payload: dict[str, Any]) -> SwarmJob:
+        job = SwarmJob(
+            job_id=f"job_{uuid.uuid4().hex[:10]}",
+            work_order_id=work_order_id,
+            payload=payload,
+            attempt=0,
+            status="queued",
         )
-        return job_id
+        self.jobs.append(job)
+        self._by_id[job.job_id] = job
+        self._queued.append(job)
+        return job
+
+    def _settle(self, job: SwarmJob, status: str) -> None:
+        job.status = status
+        job.locked_at = None
+        self._running.pop(job.job_id, None)
+        if status == "queued":
+            self._queued.append(job)
+
+    def enqueue(self, work_order_id: str, payload: dict[str, Any]) -> str:
+        return self._add(work_order_id, payload).job_id
+
+    def enqueue_many(self, items: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        return [self._add(work_order_id, payload).job_id for work_order_id, payload in items]
 
     def claim_next(self) -> SwarmJob | None:
-        for job in self.jobs:
-            if job.status == "queued":
-                job.status = "running"
-                job.attempt += 1
-                job.locked_at = _now()
-                return job
+        while self._queued:
+            job = self._queued.popleft()
+            if job.status != "queued":
+                continue
+            job.status = "running"
+            job.attempt += 1
+            job.locked_at = _now()
+            self._running[job.job_id] = job
+            return job
         return None
 
     def mark_done(self, job_id: str) -> None:
-        for job in self.jobs:
-            if job.job_id == job_id:
-                job.status = "done"
-                job.locked_at = None
-                return
+        job = self._by_id.get(job_id)
+        if job is not None:
+            self._settle(job, "done")
 
     def mark_retry(self, job_id: str, error: str, max_attempts: int = 3) -> None:
-        for job in self.jobs:
-            if job.job_id != job_id:
-                continue
-            if job.attempt >= max_attempts:
-                job.status = "dead_letter"
-            else:
-                job.status = "queued"
-            job.locked_at = None
-            job.payload["last_error"] = error
+        job = self._by_id.get(job_id)
+        if job is None:
             return
+        job.payload["last_error"] = error
+        self._settle(job, "dead_letter" if job.attempt >= max_attempts else "queued")
 
     def mark_dead_letter(self, job_id: str, error: str) -> None:
-        for job in self.jobs:
-            if job.job_id == job_id:
-                job.status = "dead_letter"
-                job.locked_at = None
-                job.payload["last_error"] = error
-                return
+        job = self._by_id.get(job_id)
+        if job is None:
+            return
+        job.payload["last_error"] = error
+        self._settle(job, "dead_letter")
 
     def recover_stale_running(self, stale_after_seconds: int = 900, max_attempts: int = 3, limit: int = 100) -> int:
         cutoff = _now() - timedelta(seconds=max(1, stale_after_seconds))
         recovered = 0
-        for job in self.jobs:
+        for job in list(self._running.values()):
             if recovered >= limit:
                 break
-            if job.status != "running" or not job.locked_at or job.locked_at > cutoff:
+            if not job.locked_at or job.locked_at > cutoff:
                 continue
-            if job.attempt >= max_attempts:
-                job.status = "dead_letter"
-            else:
-                job.status = "queued"
-            job.locked_at = None
             job.payload["last_error"] = "stale_timeout_recovered"
+            self._settle(job, "dead_letter" if job.attempt >= max_attempts else "queued")
             recovered += 1
         return recovered
 
 
+_ENQUEUE_SQL = """
+    insert into swarm_jobs (
+        job_id, work_order_id, payload, status, attempt, max_attempts, available_at, created_at, updated_at
+    )
+    values (%s, %s, %s::jsonb, 'queued', 0, 3, now(), now(), now())
+    on conflict (work_order_id) do nothing
+"""
+
+_CLAIM_NEXT_SQL = """
+    with candidate as (
+        select job_id
+        from swarm_jobs
+        where status = 'queued'
+          and available_at <= now()
+        order by available_at asc, created_at asc
+        for update skip locked
+        limit 1
+    )
+    update swarm_jobs s
+    set status = 'running',
+        attempt = s.attempt + 1,
+        locked_at = now(),
+        worker_id = %s,
+        updated_at = now()
+    from candidate c
+    where s.job_id = c.job_id
+    returning s.job_id, s.work_order_id, s.payload, s.attempt, s.status, s.locked_at
+"""
+
+_MARK_DONE_SQL = """
+    update swarm_jobs
+    set status = 'done',
+        locked_at = null,
+        updated_at = now()
+    where job_id = %s
+"""
+
+_SELECT_ATTEMPT_SQL = """
+    select attempt from swarm_jobs where job_id = %s
+"""
+
+_MARK_DEAD_LETTER_SQL = """
+    update swarm_jobs
+    set status = 'dead_letter',
+        last_error = %s,
+        locked_at = null,
+        updated_at = now()
+    where job_id = %s
+"""
+
+_MARK_REQUEUED_SQL = """
+    update swarm_jobs
+    set status = 'queued',
+        last_error = %s,
+        locked_at = null,
+        available_at = %s,
+        updated_at = now()
+    where job_id = %s
+"""
+
+_RECOVER_STALE_SQL = """
+    with candidate as (
+        select job_id, attempt
+        from swarm_jobs
+        where status = 'running'
+          and locked_at is not null
+          and locked_at <= (now() - make_interval(secs => %s))
+        order by locked_at asc
+        limit %s
+        for update skip locked
+    )
+    update swarm_jobs s
+    set status = case when c.attempt >= %s then 'dead_letter' else 'queued' end,
+        last_error = 'stale_timeout_recovered',
+        locked_at = null,
+        worker_id = null,
+        available_at = now(),
+        updated_at = now()
+    from candidate c
+    where s.job_id = c.job_id
+    returning s.job_id
+"""
+
+
+def _job_from_row(row: Any) -> SwarmJob:
+    return SwarmJob(
+        job_id=row[0],
+        work_order_id=row[1],
+        payload=row[2],
+        attempt=row[3],
+        status=row[4],
+        locked_at=row[5],
+    )
+
+
+def _retry_statement(job_id: str, error: str, attempt: int, max_attempts: int) -> tuple[str, tuple[Any, ...]]:
+    if attempt >= max_attempts:
+        return _MARK_DEAD_LETTER_SQL, (error, job_id)
+    return _MARK_REQUEUED_SQL, (error, _now() + _next_backoff(attempt), job_id)
+
+
+def _recover_params(stale_after_seconds: int, max_attempts: int, limit: int) -> tuple[int, int, int]:
+    return max(1, int(stale_after_seconds)), max(1, int(limit)), max_attempts
+
+
 class PostgresSwarmJobQueue:
     def __init__(self, database_url: str, worker_id: str = "swarm-worker-1") -> None:
         if not database_url:
@@ -111,168 +230,159 @@ class PostgresSwarmJobQueue:
         self.worker_id = worker_id
 
     def _connect(self) -> "psycopg.Connection":
-        import psycopg
-
-        return psycopg.connect(self.database_url)
+        return _load_psycopg().connect(self.database_url)
 
     def enqueue(self, work_order_id: str, payload: dict[str, Any]) -> str:
         job_id = f"job_{uuid.uuid4().hex[:10]}"
         with self._connect() as conn:
-            with conn.cursor() as cur:
+            # Pipeline the insert and the notify so they share one round-trip.
+            with conn.pipeline(), conn.cursor() as cur:
                 cur.execute(
-                    """
-                    insert into swarm_jobs (
-                        job_id, work_order_id, payload, status, attempt, max_attempts, available_at, created_at, updated_at
-                    )
-                    values (%s, %s, %s::jsonb, 'queued', 0, 3, now(), now(), now())
-                    on conflict (work_order_id) do nothing
-                    """,
+                    _ENQUEUE_SQL,
                     (job_id, work_order_id, json.dumps(payload, separators=(",", ":"))),
                 )
+                cur.execute("select pg_notify(%s, %s)", (SWARM_JOBS_CHANNEL, work_order_id))
             conn.commit()
         return job_id
 
-    def claim_next(self) -> SwarmJob | None:
+    def enqueue_many(self, items: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        if not items:
+            return []
+        job_ids = [f"job_{uuid.uuid4().hex[:10]}" for _ in items]
         with self._connect() as conn:
+            # One transaction and one notify for the whole batch.
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    with candidate as (
-                        select job_id
-                        from swarm_jobs
-                        where status = 'queued'
-                          and available_at <= now()
-                        order by available_at asc, created_at asc
-                        for update skip locked
-                        limit 1
-                    )
-                    update swarm_jobs s
-                    set status = 'running',
-                        attempt = s.attempt + 1,
-                        locked_at = now(),
-                        worker_id = %s,
-                        updated_at = now()
-                    from candidate c
-                    where s.job_id = c.job_id
-                    returning s.job_id, s.work_order_id, s.payload, s.attempt, s.status, s.locked_at
-                    """,
-                    (self.worker_id,),
+                cur.executemany(
+                    _ENQUEUE_SQL,
+                    [
+                        (job_id, work_order_id, json.dumps(payload, separators=(",", ":")))
+                        for job_id, (work_order_id, payload) in zip(job_ids, items)
+                    ],
                 )
+                cur.execute("select pg_notify(%s, %s)", (SWARM_JOBS_CHANNEL, items[-1][0]))
+            conn.commit()
+        return job_ids
+
+    def claim_next(self) -> SwarmJob | None:
+        with self._connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(_CLAIM_NEXT_SQL, (self.worker_id,))
                 row = cur.fetchone()
             conn.commit()
         if not row:
             return None
-        return SwarmJob(
-            job_id=row[0],
-            work_order_id=row[1],
-            payload=row[2],
-            attempt=row[3],
-            status=row[4],
-            locked_at=row[5],
-        )
+        return _job_from_row(row)
 
     def mark_done(self, job_id: str) -> None:
         with self._connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    update swarm_jobs
-                    set status = 'done',
-                        locked_at = null,
-                        updated_at = now()
-                    where job_id = %s
-                    """,
-                    (job_id,),
-                )
+                cur.execute(_MARK_DONE_SQL, (job_id,))
             conn.commit()
 
     def mark_retry(self, job_id: str, error: str, max_attempts: int = 3) -> None:
         with self._connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    select attempt from swarm_jobs where job_id = %s
-                    """,
-                    (job_id,),
-                )
+                cur.execute(_SELECT_ATTEMPT_SQL, (job_id,))
                 row = cur.fetchone()
                 if not row:
                     conn.commit()
                     return
-                attempt = int(row[0])
-                if attempt >= max_attempts:
-                    cur.execute(
-                        """
-                        update swarm_jobs
-                        set status = 'dead_letter',
-                            last_error = %s,
-                            locked_at = null,
-                            updated_at = now()
-                        where job_id = %s
-                        """,
-                        (error, job_id),
-                    )
-                else:
-                    delay = _next_backoff(attempt)
-                    cur.execute(
-                        """
-                        update swarm_jobs
-                        set status = 'queued',
-                            last_error = %s,
-                            locked_at = null,
-                            available_at = %s,
-                            updated_at = now()
-                        where job_id = %s
-                        """,
-                        (error, _now() + delay, job_id),
-                    )
+                sql, params = _retry_statement(job_id, error, int(row[0]), max_attempts)
+                cur.execute(sql, params)
             conn.commit()
 
     def mark_dead_letter(self, job_id: str, error: str) -> None:
         with self._connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    update swarm_jobs
-                    set status = 'dead_letter',
-                        last_error = %s,
-                        locked_at = null,
-                        updated_at = now()
-                    where job_id = %s
-                    """,
-                    (error, job_id),
-                )
+                cur.execute(_MARK_DEAD_LETTER_SQL, (error, job_id))
             conn.commit()
 
     def recover_stale_running(self, stale_after_seconds: int = 900, max_attempts: int = 3, limit: int = 100) -> int:
-        stale_after_seconds = max(1, int(stale_after_seconds))
         with self._connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    with candidate as (
-                        select job_id, attempt
-                        from swarm_jobs
-                        where status = 'running'
-                          and locked_at is not null
-                          and locked_at <= (now() - make_interval(secs => %s))
-                        order by locked_at asc
-                        limit %s
-                        for update skip locked
-                    )
-                    update swarm_jobs s
-                    set status = case when c.attempt >= %s then 'dead_letter' else 'queued' end,
-                        last_error = 'stale_timeout_recovered',
-                        locked_at = null,
-                        worker_id = null,
-                        available_at = now(),
-                        updated_at = now()
-                    from candidate c
-                    where s.job_id = c.job_id
-                    returning s.job_id
-                    """,
-                    (stale_after_seconds, max(1, int(limit)), max_attempts),
-                )
+                cur.execute(_RECOVER_STALE_SQL, _recover_params(stale_after_seconds, max_attempts, limit))
                 rows = cur.fetchall()
             conn.commit()
         return len(rows)
+
+
+class AsyncPostgresSwarmJobQueue:
+    """Asyncio variant of PostgresSwarmJobQueue backed by a shared connection pool.
+
+    Lets one event loop keep many claim/mark operations in flight instead of
+    blocking a thread per database round-trip. Call ``open()`` before use and
+    ``close()`` on shutdown.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        worker_id: str = "swarm-worker-1",
+        min_size: int = 1,
+        max_size: int = 8,
+    ) -> None:
+        if not database_url:
+            raise ValueError("DATABASE_URL is required for AsyncPostgresSwarmJobQueue.")
+        from psycopg_pool import AsyncConnectionPool
+
+        self.database_url = database_url
+        self.worker_id = worker_id
+        self._pool = AsyncConnectionPool(database_url, min_size=min_size, max_size=max_size, open=False)
+
+    async def open(self) -> None:
+        await self._pool.open()
+
+    async def close(self) -> None:
+        await self._pool.close()
+
+    async def enqueue(self, work_order_id: str, payload: dict[str, Any]) -> str:
+        job_id = f"job_{uuid.uuid4().hex[:10]}"
+        async with self._pool.connection() as conn:
+            async with conn.pipeline(), conn.cursor() as cur:
+                await cur.execute(
+                    _ENQUEUE_SQL,
+                    (job_id, work_order_id, json.dumps(payload, separators=(",", ":"))),
+                )
+                await cur.execute("select pg_notify(%s, %s)", (SWARM_JOBS_CHANNEL, work_order_id))
+        return job_id
+
+    async def claim_next(self) -> SwarmJob | None:
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(_CLAIM_NEXT_SQL, (self.worker_id,))
+                row = await cur.fetchone()
+        if not row:
+            return None
+        return _job_from_row(row)
+
+    async def mark_done(self, job_id: str) -> None:
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(_MARK_DONE_SQL, (job_id,))
+
+    async def mark_retry(self, job_id: str, error: str, max_attempts: int = 3) -> None:
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(_SELECT_ATTEMPT_SQL, (job_id,))
+                row = await cur.fetchone()
+                if not row:
+                    return
+                sql, params = _retry_statement(job_id, error, int(row[0]), max_attempts)
+                await cur.execute(sql, params)
+
+    async def mark_dead_letter(self, job_id: str, error: str) -> None:
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(_MARK_DEAD_LETTER_SQL, (error, job_id))
+
+    async def recover_stale_running(
+        self,
+        stale_after_seconds: int = 900,
+        max_attempts: int = 3,
+        limit: int = 100,
+    ) -> int:
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(_RECOVER_STALE_SQL, _recover_params(stale_after_seconds, max_attempts, limit))
+                rows = await cur.fetchall()
+        return len(rows)
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-from typing import Any, TypedDict
+from dataclasses import dataclass, field
+from typing import Any
 
 from orchestrator.models import StageResult
 from orchestrator.stages import StageContext
 
 
-class SwarmState(TypedDict):
+@dataclass(slots=True)
+class SwarmState:
     ctx: StageContext
-    last_result: StageResult | None
-    halt: bool
-    run_status: str
-    error: str | None
-    output: dict[str, Any]
+    last_result: StageResult | None = None
+    halt: bool = False
+    run_status: str = "running"
+    error: str | None = None
+    output: dict[str, Any] = field(default_factory=dict)
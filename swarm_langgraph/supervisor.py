@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Callable
 
 from orchestrator.models import StageResult
 from orchestrator.stages import StageContext
@@ -11,9 +11,19 @@ from .nodes import SwarmNodes
 from .state import SwarmState
 
 
+def _flagged_for_review(payload: dict[str, Any]) -> bool:
+    return bool(payload.get("needs_human_review"))
+
+
 class SwarmSupervisor:
     """Supervisor that coordinates specialist swarm agents via graph execution."""
 
+    _STAGE_ORDER = ("context", "graph_context", "monday_context", "draft", "qa", "policy", "publish")
+    # Stages whose review flag is derived differently from the default needs_human_review field.
+    _NEEDS_REVIEW_FNS: dict[str, Callable[[dict[str, Any]], bool]] = {
+        "qa": lambda payload: payload.get("qa_status") != "pass",
+    }
+
     def __init__(self, store: RunStore, nodes: SwarmNodes | None = None) -> None:
         self.store = store
         self.nodes = nodes or SwarmNodes()
@@ -26,26 +36,27 @@ class SwarmSupervisor:
 
         run = self.store.start_run(work_order_id=work_order_id)
         ctx = StageContext(work_order=work_order)
-        state: SwarmState = {
-            "ctx": ctx,
-            "last_result": None,
-            "halt": False,
-            "run_status": "running",
-            "error": None,
-            "output": {},
-        }
+        state = SwarmState(ctx=ctx)
 
         # Execute with either compiled LangGraph graph or fallback graph.
+        # LangGraph returns the final channel values as a dict; the fallback returns the state itself.
         final_state = self.graph.invoke(state)
 
-        # Persist deterministic stage events from ctx.state.
-        self._persist_ctx_state(run.run_id, work_order_id, ctx)
-
-        final_status = final_state.get("run_status") or "completed"
+        if isinstance(final_state, dict):
+            final_status = final_state.get("run_status") or "completed"
+        else:
+            final_status = final_state.run_status or "completed"
         if final_status == "running":
             final_status = "completed"
         final_stage = "publish" if "publish" in ctx.state else "policy"
-        self.store.finish_run(run.run_id, status=final_status, current_stage=final_stage)
+        # Persist deterministic stage events from ctx.state and close the run in one write.
+        self.store.finalize_run(
+            run.run_id,
+            work_order_id,
+            self._stage_results(ctx),
+            status=final_status,
+            current_stage=final_stage,
+        )
         return {
             "run_id": run.run_id,
             "work_order_id": work_order_id,
@@ -54,21 +65,23 @@ class SwarmSupervisor:
             "publish": ctx.state.get("publish"),
         }
 
-    def _persist_ctx_state(self, run_id: str, work_order_id: str, ctx: StageContext) -> None:
-        stage_order = ["context", "graph_context", "monday_context", "draft", "qa", "policy", "publish"]
-        for stage in stage_order:
+    def _stage_results(self, ctx: StageContext) -> list[StageResult]:
+        results: list[StageResult] = []
+        for stage in self._STAGE_ORDER:
             if stage not in ctx.state:
                 continue
             payload = ctx.state[stage]
-            needs_human_review = bool(payload.get("needs_human_review")) if isinstance(payload, dict) else False
-            if stage == "policy" and isinstance(payload, dict):
-                needs_human_review = bool(payload.get("needs_human_review"))
-            if stage == "qa" and isinstance(payload, dict):
-                needs_human_review = payload.get("qa_status") != "pass"
-            result = StageResult(
-                stage=stage,
-                payload=payload if isinstance(payload, dict) else {"value": payload},
-                needs_human_review=needs_human_review,
+            if isinstance(payload, dict):
+                needs_review_fn = self._NEEDS_REVIEW_FNS.get(stage, _flagged_for_review)
+                needs_human_review = needs_review_fn(payload)
+            else:
+                payload = {"value": payload}
+                needs_human_review = False
+            results.append(
+                StageResult(
+                    stage=stage,
+                    payload=payload,
+                    needs_human_review=needs_human_review,
+                )
             )
-            self.store.append_event(run_id, result)
-            self.store.persist_artifact(run_id, work_order_id, result)
+        return results
@@ -1,35 +1,121 @@
 #!/usr/bin/env python3
-"""Dispatch publish artifacts from Postgres to webhook."""
+"""Dispatch publish artifacts from Postgres to webhook.
+
+The claim query relies on the partial index ``idx_publish_queue_queued_ready``
+from ``orchestrator/schema.sql`` so its cost tracks queue depth rather than
+table size. On an existing large table create it ahead of deploy with::
+
+    create index concurrently if not exists idx_publish_queue_queued_ready
+        on publish_queue((coalesce(next_attempt_at, created_at)))
+        where dispatch_status = 'queued';
+"""
 
 from __future__ import annotations
 
+import asyncio
 import json
+import random
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any
-
-import requests
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Literal
 
 if TYPE_CHECKING:
-    import psycopg
+    import requests
+    from psycopg_pool import ConnectionPool
+
+
+RETRY_BASE_SECONDS = 1.0
+RETRY_CAP_SECONDS = 300.0
+# SystemRandom so parallel dispatchers do not share a seeded sequence.
+_RETRY_RANDOM = random.SystemRandom()
 
 
-@dataclass
+def _retry_delay_seconds(attempt: int) -> float:
+    # AWS "full jitter": uniform over [0, min(cap, base * 2^attempt)].
+    ceiling = min(RETRY_CAP_SECONDS, RETRY_BASE_SECONDS * (2 ** max(0, attempt)))
+    return _RETRY_RANDOM.uniform(0, ceiling)
+
+
+@dataclass(slots=True)
 class PublishQueueRow:
     row_id: int
     work_order_id: str
     payload: dict[str, Any]
     attempt: int
+    # Projected by the claim query; None means derive it from payload in Python.
+    should_send: bool | None = None
+
+
+_TRUTHY = frozenset(("1", "true", "yes", "on"))
 
 
 def _should_send(payload: dict[str, Any]) -> bool:
     raw = payload.get("send", True)
-    if isinstance(raw, bool):
+    if raw is True or raw is False:
         return raw
     if isinstance(raw, str):
-        return raw.strip().lower() in {"1", "true", "yes", "on"}
+        return raw.strip().lower() in _TRUTHY
     return bool(raw)
 
 
+ClaimMode = Literal["auto", "skip_locked", "atomic_update"]
+
+# Server-side mirror of _should_send, so the claim hands back a ready boolean.
+_SHOULD_SEND_SQL = """case jsonb_typeof({col}->'send')
+            when 'boolean' then ({col}->'send')::boolean
+            when 'string' then lower(btrim({col}->>'send')) in ('1', 'true', 'yes', 'on')
+            when 'number' then ({col}->>'send')::numeric <> 0
+            when 'null' then false
+            when 'array' then {col}->'send' <> '[]'::jsonb
+            when 'object' then {col}->'send' <> '{{}}'::jsonb
+            else true
+        end"""
+
+_CLAIM_SKIP_LOCKED_SQL = f"""
+    with candidate as (
+        select id
+        from publish_queue
+        where dispatch_status = 'queued'
+          and coalesce(next_attempt_at, created_at) <= now()
+        order by coalesce(next_attempt_at, created_at) asc
+        for update skip locked
+        limit %s
+    )
+    update publish_queue p
+    set dispatch_status = 'running',
+        dispatch_attempts = p.dispatch_attempts + 1
+    from candidate c
+    where p.id = c.id
+    returning p.id, p.work_order_id, p.payload, p.dispatch_attempts,
+        {_SHOULD_SEND_SQL.format(col="p.payload")} as should_send
+"""
+
+# Lock-free claim for CockroachDB / distributed Postgres, where SKIP LOCKED is slow
+# or unreliable. The outer status check makes a concurrent double-claim a no-op.
+_CLAIM_ATOMIC_UPDATE_SQL = f"""
+    update publish_queue
+    set dispatch_status = 'running',
+        dispatch_attempts = dispatch_attempts + 1
+    where id in (
+        select id
+        from publish_queue
+        where dispatch_status = 'queued'
+          and coalesce(next_attempt_at, created_at) <= now()
+        order by coalesce(next_attempt_at, created_at) asc
+        limit %s
+    )
+      and dispatch_status = 'queued'
+    returning id, work_order_id, payload, dispatch_attempts,
+        {_SHOULD_SEND_SQL.format(col="payload")} as should_send
+"""
+
+_CLAIM_SQL_BY_MODE = {
+    "skip_locked": _CLAIM_SKIP_LOCKED_SQL,
+    "atomic_update": _CLAIM_ATOMIC_UPDATE_SQL,
+}
+
+
 class SwarmPublishDispatcher:
     def __init__(
         self,
@@ -37,53 +123,89 @@ class SwarmPublishDispatcher:
         webhook_url: str,
         auto_send_enabled: bool,
         max_attempts: int = 5,
+        claim_mode: ClaimMode = "auto",
     ) -> None:
         if not database_url:
             raise ValueError("DATABASE_URL is required for SwarmPublishDispatcher.")
+        if claim_mode != "auto" and claim_mode not in _CLAIM_SQL_BY_MODE:
+            raise ValueError(f"claim_mode must be one of: auto, {', '.join(sorted(_CLAIM_SQL_BY_MODE))}")
+        self.claim_mode: str = claim_mode
         self.database_url = database_url
         self.webhook_url = webhook_url.strip()
         self.auto_send_enabled = auto_send_enabled
         self.max_attempts = max(1, int(max_attempts))
+        # aiohttp session for process_batch_async; opened on first use, on the caller's loop.
+        self._aio_session: Any = None
+
+    # Pool and HTTP session open on first use, so constructing a dispatcher costs nothing
+    # until it actually claims or posts.
+    @cached_property
+    def pool(self) -> "ConnectionPool":
+        return self._open_pool()
+
+    @cached_property
+    def _session(self) -> "requests.Session":
+        # One keep-alive session for the single webhook target.
+        import requests
+        from requests.adapters import HTTPAdapter
 
-    def _connect(self) -> "psycopg.Connection":
-        import psycopg
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+        return session
 
-        return psycopg.connect(self.database_url)
+    def _open_pool(self) -> "ConnectionPool":
+        from psycopg_pool import ConnectionPool
+
+        return ConnectionPool(
+            self.database_url,
+            min_size=1,
+            max_size=4,
+            kwargs={"autocommit": False},
+            open=True,
+        )
+
+    def close(self) -> None:
+        # Only close what was actually opened; touching the properties here would open them.
+        if "_session" in self.__dict__:
+            self._session.close()
+        if "pool" in self.__dict__:
+            self.pool.close()
+
+    async def aclose(self) -> None:
+        if self._aio_session is not None:
+            await self._aio_session.close()
+            self._aio_session = None
 
     def claim_next(self) -> PublishQueueRow | None:
-        with self._connect() as conn:
+        rows = self.claim_batch(1)
+        return rows[0] if rows else None
+
+    def _resolve_claim_mode(self) -> str:
+        if self.claim_mode == "auto":
+            with self.pool.connection() as conn:
+                version = str(conn.execute("select version()").fetchone()[0])
+            self.claim_mode = "atomic_update" if "CockroachDB" in version else "skip_locked"
+        return self.claim_mode
+
+    def claim_batch(self, limit: int) -> list[PublishQueueRow]:
+        sql = _CLAIM_SQL_BY_MODE[self._resolve_claim_mode()]
+        with self.pool.connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    with candidate as (
-                        select id
-                        from publish_queue
-                        where dispatch_status = 'queued'
-                        order by created_at asc
-                        for update skip locked
-                        limit 1
-                    )
-                    update publish_queue p
-                    set dispatch_status = 'running',
-                        dispatch_attempts = p.dispatch_attempts + 1
-                    from candidate c
-                    where p.id = c.id
-                    returning p.id, p.work_order_id, p.payload, p.dispatch_attempts
-                    """
-                )
-                row = cur.fetchone()
-            conn.commit()
-        if not row:
-            return None
-        return PublishQueueRow(
-            row_id=int(row[0]),
-            work_order_id=str(row[1]),
-            payload=row[2] if isinstance(row[2], dict) else {},
-            attempt=int(row[3]),
-        )
+                cur.execute(sql, (max(1, int(limit)),))
+                rows = cur.fetchall()
+        return [
+            PublishQueueRow(
+                row_id=int(row[0]),
+                work_order_id=str(row[1]),
+                payload=row[2] if isinstance(row[2], dict) else {},
+                attempt=int(row[3]),
+                should_send=bool(row[4]),
+            )
+            for row in rows
+        ]
 
     def mark_dispatched(self, row_id: int, note: str = "") -> None:
-        with self._connect() as conn:
+        with self.pool.connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -95,64 +217,180 @@ class SwarmPublishDispatcher:
                     """,
                     (note or None, row_id),
                 )
-            conn.commit()
+
+    def _retry_status(self, attempt: int) -> str:
+        return "dead_letter" if attempt >= self.max_attempts else "queued"
 
     def mark_retry_or_dead_letter(self, row_id: int, attempt: int, error: str) -> str:
-        if attempt >= self.max_attempts:
-            status = "dead_letter"
-        else:
-            status = "queued"
-        with self._connect() as conn:
+        status = self._retry_status(attempt)
+        delay = _retry_delay_seconds(attempt) if status == "queued" else None
+        with self.pool.connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
                     update publish_queue
                     set dispatch_status = %s,
-                        last_error = %s
+                        last_error = %s,
+                        next_attempt_at = case
+                            when %s::float8 is null then next_attempt_at
+                            else now() + (%s::float8 * interval '1 second')
+                        end
                     where id = %s
                     """,
-                    (status, error[:1000], row_id),
+                    (status, error[:1000], delay, delay, row_id),
                 )
-            conn.commit()
         return status
 
+    def mark_batch(self, updates: list[tuple[int, str, str | None, float | None]]) -> None:
+        """Apply terminal (row_id, status, last_error, retry_delay_seconds) updates in one statement."""
+        if not updates:
+            return
+        row_ids, statuses, errors, delays = (list(col) for col in zip(*updates))
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    update publish_queue p
+                    set dispatch_status = v.status,
+                        dispatched_at = case when v.status = 'dispatched' then now() else p.dispatched_at end,
+                        last_error = v.last_error,
+                        next_attempt_at = case
+                            when v.delay is null then p.next_attempt_at
+                            else now() + (v.delay * interval '1 second')
+                        end
+                    from unnest(%s::bigint[], %s::text[], %s::text[], %s::float8[]) as v(id, status, last_error, delay)
+                    where p.id = v.id
+                    """,
+                    (row_ids, statuses, errors, delays),
+                )
+
     def _post(self, payload: dict[str, Any]) -> tuple[bool, str]:
         if not self.webhook_url:
             return False, "webhook_not_configured"
         try:
-            resp = requests.post(self.webhook_url, json=payload, timeout=8)
+            resp = self._session.post(self.webhook_url, json=payload, timeout=8)
             if resp.status_code >= 400:
                 return False, f"webhook_http_{resp.status_code}"
             return True, ""
         except Exception as exc:
             return False, f"webhook_exception:{type(exc).__name__}"
 
-    def process_once(self) -> dict[str, Any]:
-        row = self.claim_next()
-        if not row:
-            return {"status": "empty"}
+    async def _post_async(self, session: Any, payload: dict[str, Any]) -> tuple[bool, str]:
+        if not self.webhook_url:
+            return False, "webhook_not_configured"
+        try:
+            async with session.post(self.webhook_url, json=payload) as resp:
+                if resp.status >= 400:
+                    return False, f"webhook_http_{resp.status}"
+                return True, ""
+        except Exception as exc:
+            return False, f"webhook_exception:{type(exc).__name__}"
 
-        should_send = _should_send(row.payload)
+    def _skip_reason(self, row: PublishQueueRow) -> str:
+        should_send = row.should_send if row.should_send is not None else _should_send(row.payload)
         if not should_send:
-            self.mark_dispatched(row.row_id, note="send_false")
-            return {"status": "skipped", "work_order_id": row.work_order_id, "reason": "send_false"}
-
+            return "send_false"
         if not self.auto_send_enabled:
-            self.mark_dispatched(row.row_id, note="auto_send_disabled")
-            return {
-                "status": "skipped",
-                "work_order_id": row.work_order_id,
-                "reason": "auto_send_disabled",
-            }
+            return "auto_send_disabled"
+        return ""
 
+    def _deliver(self, row: PublishQueueRow) -> tuple[str, str]:
+        skip_reason = self._skip_reason(row)
+        if skip_reason:
+            return "skipped", skip_reason
         ok, err = self._post(row.payload)
         if ok:
+            return "dispatched", ""
+        return "failed", err
+
+    def process_once(self) -> dict[str, Any]:
+        row = self.claim_next()
+        if not row:
+            return {"status": "empty"}
+
+        outcome, detail = self._deliver(row)
+        if outcome == "skipped":
+            self.mark_dispatched(row.row_id, note=detail)
+            return {"status": "skipped", "work_order_id": row.work_order_id, "reason": detail}
+
+        if outcome == "dispatched":
             self.mark_dispatched(row.row_id)
             return {"status": "dispatched", "work_order_id": row.work_order_id}
 
-        next_status = self.mark_retry_or_dead_letter(row.row_id, attempt=row.attempt, error=err)
+        next_status = self.mark_retry_or_dead_letter(row.row_id, attempt=row.attempt, error=detail)
         return {
             "status": next_status,
             "work_order_id": row.work_order_id,
-            "error": err,
+            "error": detail,
         }
+
+    async def _deliver_async(self, session: Any, row: PublishQueueRow) -> tuple[str, str]:
+        skip_reason = self._skip_reason(row)
+        if skip_reason:
+            return "skipped", skip_reason
+        ok, err = await self._post_async(session, row.payload)
+        if ok:
+            return "dispatched", ""
+        return "failed", err
+
+    def _finish_batch(self, rows: list[PublishQueueRow], outcomes: list[tuple[str, str]]) -> dict[str, Any]:
+        results: list[dict[str, Any]] = []
+        updates: list[tuple[int, str, str | None, float | None]] = []
+        for row, (outcome, detail) in zip(rows, outcomes):
+            if outcome == "skipped":
+                updates.append((row.row_id, "dispatched", detail, None))
+                results.append({"status": "skipped", "work_order_id": row.work_order_id, "reason": detail})
+            elif outcome == "dispatched":
+                updates.append((row.row_id, "dispatched", None, None))
+                results.append({"status": "dispatched", "work_order_id": row.work_order_id})
+            else:
+                next_status = self._retry_status(row.attempt)
+                delay = _retry_delay_seconds(row.attempt) if next_status == "queued" else None
+                updates.append((row.row_id, next_status, detail[:1000], delay))
+                results.append({"status": next_status, "work_order_id": row.work_order_id, "error": detail})
+        self.mark_batch(updates)
+        return {"status": "batch", "claimed": len(rows), "results": results}
+
+    def process_once_batch(self, limit: int = 10, max_workers: int = 4) -> dict[str, Any]:
+        rows = self.claim_batch(limit)
+        if not rows:
+            return {"status": "empty", "claimed": 0, "results": []}
+
+        # Webhook posts are I/O-bound, so a small thread pool overlaps them.
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(rows)))) as executor:
+            outcomes = list(executor.map(self._deliver, rows))
+        return self._finish_batch(rows, outcomes)
+
+    async def _async_session(self, concurrency: int) -> Any:
+        if self._aio_session is None or self._aio_session.closed:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(limit=max(1, concurrency), keepalive_timeout=30)
+            self._aio_session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=8))
+        return self._aio_session
+
+    async def process_batch_async(self, limit: int = 32, concurrency: int = 32) -> dict[str, Any]:
+        """Batch dispatch with all webhook posts in flight on one event loop.
+
+        Claim and status updates stay on the synchronous pool and run in a worker
+        thread so they never block the loop; only the HTTP fan-out is async,
+        which is where slow webhook targets cost throughput. A post that raises
+        counts as a failed delivery, so every claimed row still gets its update.
+        The HTTP session is kept between calls for keep-alive, so drive every
+        call from the same loop and ``await aclose()`` before it shuts down;
+        ``concurrency`` applies when that session is first opened.
+        """
+        rows = await asyncio.to_thread(self.claim_batch, limit)
+        if not rows:
+            return {"status": "empty", "claimed": 0, "results": []}
+
+        session = await self._async_session(concurrency)
+        gathered = await asyncio.gather(
+            *(self._deliver_async(session, row) for row in rows),
+            return_exceptions=True,
+        )
+        outcomes = [
+            ("failed", f"webhook_exception:{type(outcome).__name__}") if isinstance(outcome, BaseException) else outcome
+            for outcome in gathered
+        ]
+        return await asyncio.to_thread(self._finish_batch, rows, outcomes)
@@ -4,18 +4,126 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import os
+import select
+import sys
+import threading
 import time
 from pathlib import Path
+from typing import Any, Callable
 
-from orchestrator.store import InMemoryRunStore, PostgresRunStore
+from orchestrator.store import PUBLISH_QUEUE_CHANNEL, InMemoryRunStore, PostgresRunStore
 from swarm_ingest import ActionableSwarmIngestor
-from swarm_langgraph.queue import InMemorySwarmJobQueue, PostgresSwarmJobQueue
+from swarm_langgraph.queue import SWARM_JOBS_CHANNEL, InMemorySwarmJobQueue, PostgresSwarmJobQueue
 from swarm_langgraph.supervisor import SwarmSupervisor
 from swarm_langgraph.worker import SwarmWorker
 from swarm_publish_dispatcher import SwarmPublishDispatcher
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_EMIT_LOCK = threading.Lock()
+
+
+def _emit(record: dict[str, Any]) -> None:
+    # Compact, key-sorted JSON line per loop event; orjson keeps this off the hot path.
+    with _EMIT_LOCK:
+        if orjson is None:
+            print(json.dumps(record, separators=(",", ":"), sort_keys=True), flush=True)
+            return
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(record, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) + b"\n")
+        sys.stdout.buffer.flush()
+
+
+class PostgresWakeup:
+    """Dedicated LISTEN connection that lets the idle loop wake on NOTIFY instead of sleeping."""
+
+    def __init__(self, database_url: str, channels: tuple[str, ...]) -> None:
+        import psycopg
+
+        self._conn = psycopg.connect(database_url, autocommit=True)
+        for channel in channels:
+            self._conn.execute(f"listen {channel}")
+
+    def wait(self, timeout: float) -> bool:
+        ready, _, _ = select.select([self._conn.fileno()], [], [], timeout)
+        if ready:
+            # Any round-trip drains the pending notifications off the socket.
+            self._conn.execute("select 1")
+        return bool(ready)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _poll_delay_seconds(claimed: int, batch_size: int, interval_seconds: int) -> float:
+    # Skip the sleep while the loop is saturated; back off partially on a short batch.
+    if claimed >= batch_size:
+        return 0.0
+    interval = max(1, interval_seconds)
+    if claimed:
+        return interval / 4
+    return float(interval)
+
+
+def _open_wakeup(database_url: str, channel: str) -> PostgresWakeup | None:
+    try:
+        return PostgresWakeup(database_url, channels=(channel,))
+    except Exception as exc:
+        _emit({"swarm_listen_unavailable": str(exc), "channel": channel})
+        return None
+
+
+def _idle(wakeup: PostgresWakeup | None, delay: float, stop: threading.Event) -> PostgresWakeup | None:
+    # Returns the wakeup to keep using, or None once it has failed and polling takes over.
+    if wakeup:
+        # Polling stays as the backstop for NOTIFYs missed while busy or reconnecting.
+        # Short slices keep a shutdown from waiting out the full poll interval.
+        deadline = time.monotonic() + delay
+        try:
+            while not stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or wakeup.wait(min(remaining, 1.0)):
+                    break
+            return wakeup
+        except Exception as exc:
+            _emit({"swarm_listen_failed": str(exc)})
+            wakeup.close()
+    stop.wait(delay)
+    return None
+
+
+def _run_loops(loops: list[Callable[[], None]], stop: threading.Event) -> None:
+    # Each loop runs on its own thread; the first failure stops the others and is re-raised.
+    errors: list[BaseException] = []
+
+    def _guard(loop: Callable[[], None]) -> None:
+        try:
+            loop()
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+
+    threads = [threading.Thread(target=_guard, args=(loop,), name=loop.__name__, daemon=True) for loop in loops]
+    for thread in threads:
+        thread.start()
+    try:
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=30)
+    if errors:
+        raise errors[0]
+
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Run swarm worker loop.")
@@ -38,8 +146,12 @@ def main() -> int:
     auto_send_enabled = os.environ.get("AUTO_SEND_ENABLED", "false").strip().lower() in {"1", "true", "yes", "on"}
     publish_webhook_url = os.environ.get("PUBLISH_WEBHOOK_URL", "").strip()
     dispatch_max_attempts = int(os.environ.get("SWARM_PUBLISH_MAX_ATTEMPTS", "5"))
+    dispatch_batch_size = max(1, int(os.environ.get("SWARM_DISPATCH_BATCH_SIZE", "10")))
+    dispatch_claim_mode = os.environ.get("SWARM_DISPATCH_CLAIM_MODE", "auto").strip().lower()
+    dispatch_async = os.environ.get("SWARM_DISPATCH_ASYNC", "false").strip().lower() in {"1", "true", "yes", "on"}
 
     dispatcher = None
+    database_url = ""
     if args.dry_run:
         queue = InMemorySwarmJobQueue()
         store = InMemoryRunStore()
@@ -54,6 +166,7 @@ def main() -> int:
                 webhook_url=publish_webhook_url,
                 auto_send_enabled=auto_send_enabled,
                 max_attempts=dispatch_max_attempts,
+                claim_mode=dispatch_claim_mode,
             )
 
     supervisor = SwarmSupervisor(store=store)
@@ -68,41 +181,78 @@ def main() -> int:
         else None
     )
 
-    if args.once:
-        ingest_stats = ingestor.ingest_once() if ingestor else {"rows_read": 0, "rows_enqueued": 0, "rows_skipped": 0}
-        recovered = worker.recover_stale_once(stale_after_seconds=max(1, args.stale_timeout_seconds))
-        result = worker.process_once()
-        dispatch_result = dispatcher.process_once() if dispatcher else {"status": "disabled"}
-        print(
-            json.dumps(
-                {
-                    "ingest": ingest_stats,
-                    "recovered_stale_jobs": recovered,
-                    "worker": result or {"status": "empty"},
-                    "dispatch": dispatch_result,
-                },
-                indent=2,
-                sort_keys=True,
+    try:
+        if args.once:
+            ingest_stats = ingestor.ingest_once() if ingestor else {"rows_read": 0, "rows_enqueued": 0, "rows_skipped": 0}
+            recovered = worker.recover_stale_once(stale_after_seconds=max(1, args.stale_timeout_seconds))
+            result = worker.process_once()
+            dispatch_result = dispatcher.process_once() if dispatcher else {"status": "disabled"}
+            print(
+                json.dumps(
+                    {
+                        "ingest": ingest_stats,
+                        "recovered_stale_jobs": recovered,
+                        "worker": result or {"status": "empty"},
+                        "dispatch": dispatch_result,
+                    },
+                    indent=2,
+                    sort_keys=True,
+                )
             )
-        )
-        return 0
+            return 0
+
+        stop = threading.Event()
 
-    while True:
-        if ingestor:
-            ingest_stats = ingestor.ingest_once()
-            if ingest_stats.get("rows_enqueued", 0):
-                print(json.dumps({"swarm_ingest": ingest_stats}, separators=(",", ":"), sort_keys=True))
-        recovered = worker.recover_stale_once(stale_after_seconds=max(1, args.stale_timeout_seconds))
-        if recovered:
-            print(json.dumps({"swarm_reaper_recovered": recovered}, separators=(",", ":"), sort_keys=True))
-        result = worker.process_once()
-        if result:
-            print(json.dumps(result, separators=(",", ":"), sort_keys=True))
-        dispatch_result = dispatcher.process_once() if dispatcher else None
-        if dispatch_result and dispatch_result.get("status") not in {"empty", "disabled"}:
-            print(json.dumps({"swarm_dispatch": dispatch_result}, separators=(",", ":"), sort_keys=True))
-        if not result and (not dispatch_result or dispatch_result.get("status") in {"empty", "disabled"}):
-            time.sleep(max(1, args.interval_seconds))
+        def worker_loop() -> None:
+            wakeup = None if args.dry_run else _open_wakeup(database_url, SWARM_JOBS_CHANNEL)
+            try:
+                while not stop.is_set():
+                    if ingestor:
+                        ingest_stats = ingestor.ingest_once()
+                        if ingest_stats.get("rows_enqueued", 0):
+                            _emit({"swarm_ingest": ingest_stats})
+                    recovered = worker.recover_stale_once(stale_after_seconds=max(1, args.stale_timeout_seconds))
+                    if recovered:
+                        _emit({"swarm_reaper_recovered": recovered})
+                    result = worker.process_once()
+                    if result:
+                        _emit(result)
+                    delay = _poll_delay_seconds(1 if result else 0, 1, args.interval_seconds)
+                    if delay:
+                        wakeup = _idle(wakeup, delay, stop)
+            finally:
+                if wakeup:
+                    wakeup.close()
+
+        def dispatch_loop() -> None:
+            wakeup = _open_wakeup(database_url, PUBLISH_QUEUE_CHANNEL)
+            # One loop for the whole thread so the async dispatcher keeps its webhook connections.
+            runner = asyncio.Runner() if dispatch_async else None
+            try:
+                while not stop.is_set():
+                    if runner:
+                        dispatch_result = runner.run(dispatcher.process_batch_async(limit=dispatch_batch_size))
+                    else:
+                        dispatch_result = dispatcher.process_once_batch(limit=dispatch_batch_size)
+                    dispatch_claimed = int(dispatch_result.get("claimed", 0))
+                    if dispatch_claimed:
+                        _emit({"swarm_dispatch": dispatch_result})
+                    delay = _poll_delay_seconds(dispatch_claimed, dispatch_batch_size, args.interval_seconds)
+                    if delay:
+                        wakeup = _idle(wakeup, delay, stop)
+            finally:
+                if runner:
+                    runner.run(dispatcher.aclose())
+                    runner.close()
+                if wakeup:
+                    wakeup.close()
+
+        # Worker and dispatcher poll independently so a slow webhook never stalls job processing.
+        _run_loops([worker_loop, dispatch_loop] if dispatcher else [worker_loop], stop)
+        return 0
+    finally:
+        if dispatcher:
+            dispatcher.close()
 
 
 if __name__ == "__main__":
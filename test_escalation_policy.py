@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+import json
+import os
 import tempfile
 import unittest
 from pathlib import Path
@@ -16,6 +18,16 @@ class EscalationPolicyTests(unittest.TestCase):
             self.assertIn("tiers", policy)
             self.assertIn("triggers", policy)
 
+    def test_load_policy_is_cached_until_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "policy.json"
+            policy = load_policy(path)
+            self.assertIs(load_policy(path), policy)
+            path.write_text(json.dumps({"tiers": {}, "triggers": {}}), encoding="utf-8")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertEqual(load_policy(path)["tiers"], {})
+
     def test_classify_tier_c_keyword(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             policy = load_policy(Path(td) / "policy.json")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from jsonl_io import append_row, append_rows, read_rows_since, start_signature
+
+
+class JsonlIoTests(unittest.TestCase):
+    def test_append_and_read_since_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "nested" / "rows.jsonl"
+            append_rows(path, [{"id": "a", "n": 1}, {"id": "b", "text": "héllo"}])
+            rows, offset = read_rows_since(path)
+            self.assertEqual(rows, [{"id": "a", "n": 1}, {"id": "b", "text": "héllo"}])
+            self.assertEqual(offset, path.stat().st_size)
+
+            append_row(path, {"id": "c"})
+            self.assertEqual(read_rows_since(path, offset), ([{"id": "c"}], path.stat().st_size))
+
+    def test_read_since_invalid_and_partial_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "rows.jsonl"
+            path.write_text('{"id": "a"}\n\nnot json\n[1, 2]\n{"id": "b"}\n{"id": "c"', encoding="utf-8")
+            rows, offset = read_rows_since(path, skip_invalid=True)
+            self.assertEqual(rows, [{"id": "a"}, {"id": "b"}])
+            # The unterminated trailing line is left for the next read.
+            self.assertEqual(offset, path.stat().st_size - len('{"id": "c"'))
+            with self.assertRaises(ValueError):
+                read_rows_since(path)
+            self.assertEqual(read_rows_since(Path(td) / "missing.jsonl"), ([], 0))
+
+    def test_start_signature_survives_appends_but_not_rewrites(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "rows.jsonl"
+            append_row(path, {"id": "a"})
+            size = path.stat().st_size
+            signature = start_signature(path, size)
+            append_row(path, {"id": "b"})
+            self.assertEqual(start_signature(path, size), signature)
+            path.write_text('{"id": "z"}\n', encoding="utf-8")
+            self.assertNotEqual(start_signature(path, size), signature)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 
 import monday_crm_enrichment_service as svc
 
@@ -58,12 +59,8 @@ class MondayCRMEnrichmentTests(unittest.TestCase):
             svc.enrich_lead({"lead": "not-an-object"})
 
     def test_configured_board_ids(self) -> None:
-        prev = svc.MONDAY_BOARD_IDS
-        try:
-            svc.MONDAY_BOARD_IDS = "18397429943, 777, bad,"
+        with patch.multiple(svc, MONDAY_BOARD_IDS="18397429943, 777, bad,"):
             self.assertEqual(svc.configured_board_ids(), [18397429943, 777])
-        finally:
-            svc.MONDAY_BOARD_IDS = prev
 
     def test_board_query_builder(self) -> None:
         query = svc._build_board_summary_query([18397429943, 777])
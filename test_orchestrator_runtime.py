@@ -28,8 +28,18 @@ class OrchestratorRuntimeTests(unittest.TestCase):
         self.assertIn(result["status"], {"completed", "needs_human_review"})
         self.assertEqual(result["current_stage"], "publish")
         self.assertGreaterEqual(len(store.events), 8)
-        self.assertEqual(store.events[0]["stage"], "tier")
-        self.assertEqual(store.events[-1]["stage"], "publish")
+        self.assertEqual(store.events[0].stage, "tier")
+        self.assertEqual(store.events[-1].stage, "publish")
+
+    def test_in_memory_store_caps_recorded_events(self) -> None:
+        store = InMemoryRunStore(max_records=5)
+        orchestrator = DurableOrchestrator(
+            store=store,
+            stages=default_legacy_stages(),
+        )
+        orchestrator.run_work_order({"id": "wo_cap_1", "sender": "person@example.com", "subject": "Hi"})
+        self.assertEqual(len(store.events), 5)
+        self.assertEqual(store.events[-1].stage, "publish")
 
     def test_run_work_order_requires_id(self) -> None:
         store = InMemoryRunStore()
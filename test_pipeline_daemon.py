@@ -7,6 +7,7 @@ from pathlib import Path
 from unittest.mock import patch
 
 import pipeline_daemon
+from jsonl_io import append_row
 from precedent_memory import PrecedentMatch
 
 
@@ -42,13 +43,12 @@ class PipelineDaemonTests(unittest.TestCase):
             )
 
             # Patch module globals for isolated test paths.
-            old_actionable = pipeline_daemon.ACTIONABLE_PATH
-            old_pipeline_dir = pipeline_daemon.PIPELINE_DIR
-            old_state_path = pipeline_daemon.STATE_PATH
-            try:
-                pipeline_daemon.ACTIONABLE_PATH = actionable
-                pipeline_daemon.PIPELINE_DIR = pipeline_dir
-                pipeline_daemon.STATE_PATH = state_path
+            with patch.multiple(
+                pipeline_daemon,
+                ACTIONABLE_PATH=actionable,
+                PIPELINE_DIR=pipeline_dir,
+                STATE_PATH=state_path,
+            ):
                 with patch.object(
                     pipeline_daemon,
                     "quality_gate_agent",
@@ -60,10 +60,6 @@ class PipelineDaemonTests(unittest.TestCase):
                     },
                 ):
                     processed = pipeline_daemon.run_once(actionable_path=actionable)
-            finally:
-                pipeline_daemon.ACTIONABLE_PATH = old_actionable
-                pipeline_daemon.PIPELINE_DIR = old_pipeline_dir
-                pipeline_daemon.STATE_PATH = old_state_path
 
             self.assertEqual(processed, 1)
             self.assertTrue((pipeline_dir / "drafts.jsonl").exists())
@@ -73,6 +69,70 @@ class PipelineDaemonTests(unittest.TestCase):
             publish_rows = (pipeline_dir / "draft_publish_payloads.jsonl").read_text(encoding="utf-8").splitlines()
             self.assertEqual(len(publish_rows), 1)
 
+    def test_run_once_resumes_from_actionable_cursor(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            actionable = root / "actionable.jsonl"
+            pipeline_dir = root / "pipeline_out"
+            rows = [
+                {"work_order": {"id": f"wo_cursor_{i}", "sender": "person@example.com", "subject": "Hi"}}
+                for i in range(3)
+            ]
+            _write_jsonl(actionable, rows[:2])
+
+            with patch.multiple(
+                pipeline_daemon,
+                PIPELINE_DIR=pipeline_dir,
+                STATE_PATH=pipeline_dir / "daemon_state.json",
+            ):
+                with patch.object(pipeline_daemon, "process_work_order") as process:
+                    self.assertEqual(pipeline_daemon.run_once(actionable_path=actionable), 2)
+                    self.assertEqual(pipeline_daemon.run_once(actionable_path=actionable), 0)
+                    append_row(actionable, rows[2])
+                    self.assertEqual(pipeline_daemon.run_once(actionable_path=actionable), 1)
+
+            processed = [call.kwargs["work_order"]["id"] for call in process.call_args_list]
+            self.assertEqual(processed, ["wo_cursor_0", "wo_cursor_1", "wo_cursor_2"])
+
+    def test_run_once_restarts_when_actionable_is_rewritten_in_place(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            actionable = root / "actionable.jsonl"
+            pipeline_dir = root / "pipeline_out"
+            actionable.write_text(
+                json.dumps({"work_order": {"id": "wo_old", "sender": "a@example.com"}}) + "\n",
+                encoding="utf-8",
+            )
+
+            with patch.multiple(
+                pipeline_daemon,
+                PIPELINE_DIR=pipeline_dir,
+                STATE_PATH=pipeline_dir / "daemon_state.json",
+            ):
+                with patch.object(pipeline_daemon, "process_work_order") as process:
+                    self.assertEqual(pipeline_daemon.run_once(actionable_path=actionable), 1)
+                    inode = actionable.stat().st_ino
+                    # Same inode, longer content: the old offset now lands mid-line.
+                    with actionable.open("w", encoding="utf-8") as f:
+                        f.write(json.dumps({"work_order": {"id": "wo_new_1", "sender": "b@example.com"}}) + "\n")
+                        f.write(json.dumps({"work_order": {"id": "wo_new_2", "sender": "c@example.com"}}) + "\n")
+                    self.assertEqual(actionable.stat().st_ino, inode)
+                    self.assertEqual(pipeline_daemon.run_once(actionable_path=actionable), 2)
+
+                    # A cursor whose signature still matches but whose offset is mid-line falls back to 0.
+                    state_path = pipeline_dir / "daemon_state.json"
+                    state = json.loads(state_path.read_text(encoding="utf-8"))
+                    state["actionable_cursor"]["fingerprint"][2] = -1
+                    state["actionable_cursor"]["offset"] = 5
+                    state["actionable_cursor"]["start_sig"] = pipeline_daemon.start_signature(actionable, 5)
+                    state_path.write_text(json.dumps(state), encoding="utf-8")
+                    self.assertEqual(pipeline_daemon.run_once(actionable_path=actionable), 0)
+                    cursor = json.loads(state_path.read_text(encoding="utf-8"))["actionable_cursor"]
+                    self.assertEqual(cursor["offset"], actionable.stat().st_size)
+
+            processed = [call.kwargs["work_order"]["id"] for call in process.call_args_list]
+            self.assertEqual(processed, ["wo_old", "wo_new_1", "wo_new_2"])
+
     def test_draft_agent_uses_openai_when_available(self) -> None:
         work_order = {
             "id": "wo_test_openai",
@@ -102,7 +162,8 @@ class PipelineDaemonTests(unittest.TestCase):
         }
 
         with patch.object(pipeline_daemon, "OPENAI_API_KEY", "sk-test"):
-            with patch("pipeline_daemon.requests.post") as mock_post:
+            with patch.object(pipeline_daemon, "_openai_session") as mock_session:
+                mock_post = mock_session.return_value.post
                 mock_post.return_value.raise_for_status.return_value = None
                 mock_post.return_value.json.return_value = fake_response
 
@@ -117,6 +178,18 @@ class PipelineDaemonTests(unittest.TestCase):
         self.assertGreaterEqual(draft["confidence"], 0.9)
         self.assertEqual(draft["to"], "person@example.com")
 
+    def test_draft_agent_falls_back_when_content_is_not_an_object(self) -> None:
+        work_order = {"id": "wo_bad_json", "sender": "person@example.com", "subject": "Hello"}
+        fake_response = {"choices": [{"message": {"content": json.dumps(["not", "a", "draft"])}}]}
+
+        with patch.object(pipeline_daemon, "OPENAI_API_KEY", "sk-test"):
+            with patch.object(pipeline_daemon, "_openai_session") as mock_session:
+                mock_session.return_value.post.return_value.json.return_value = fake_response
+                draft = pipeline_daemon.draft_agent(work_order=work_order, context={}, policy_tier="B")
+
+        self.assertEqual(draft["draft_agent"], "template_fallback")
+        self.assertIn("RuntimeError", draft["rationale"])
+
     def test_qa_agent_fails_on_low_confidence_and_tone_fact_issues(self) -> None:
         work_order = {
             "id": "wo_low_quality",
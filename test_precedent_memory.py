@@ -26,6 +26,23 @@ class PrecedentMemoryTests(unittest.TestCase):
             self.assertEqual(result.decision, "approve")
             self.assertGreaterEqual(result.confidence, 0.7)
 
+    def test_index_tracks_appends_and_falls_back_when_stale(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "precedents.jsonl"
+            append_precedent("a@example.com", ["sales"], "A", "approve", path=path)
+            append_precedent("a@example.com", ["sales"], "A", "reject", path=path)
+            self.assertTrue((Path(td) / "precedents.idx.json").exists())
+            result = lookup_precedent("a@example.com", ["sales"], "A", path=path)
+            self.assertEqual(result.sample_size, 2)
+            self.assertAlmostEqual(result.confidence, 0.5)
+
+            # A row written without the index makes it stale; lookups rescan the file.
+            with path.open("a", encoding="utf-8") as f:
+                f.write('{"key":"example.com|sales|A","decision":"approve"}\n')
+            result = lookup_precedent("a@example.com", ["sales"], "A", path=path)
+            self.assertEqual(result.sample_size, 3)
+            self.assertEqual(result.decision, "approve")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import json
+import os
 import tempfile
 import unittest
 from pathlib import Path
@@ -20,22 +21,67 @@ class PublishSenderTests(unittest.TestCase):
                 encoding="utf-8",
             )
 
-            old_publish = ps.PUBLISH_FILE
-            old_state = ps.STATE_PATH
-            try:
-                ps.PUBLISH_FILE = pfile
-                ps.STATE_PATH = state
+            with patch.multiple(ps, PUBLISH_FILE=pfile, STATE_PATH=state):
                 with patch("publish_sender.send_payload") as send_payload:
                     count = ps.process_once()
                     send_payload.assert_not_called()
-            finally:
-                ps.PUBLISH_FILE = old_publish
-                ps.STATE_PATH = old_state
 
             self.assertEqual(count, 0)
             sent_ids = json.loads(state.read_text(encoding="utf-8")).get("sent_ids", [])
             self.assertEqual(sent_ids, ["wo_1"])
 
+    def test_process_once_resumes_at_first_failed_send(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            pfile = root / "draft_publish_payloads.jsonl"
+            state = root / "publish_sender_state.json"
+            pfile.write_text(
+                json.dumps({"work_order_id": "wo_1"}) + "\n" + json.dumps({"work_order_id": "wo_2"}) + "\n",
+                encoding="utf-8",
+            )
+
+            with patch.multiple(ps, PUBLISH_FILE=pfile, STATE_PATH=state):
+                with patch("publish_sender.send_payload", side_effect=[True, False]):
+                    self.assertEqual(ps.process_once(), 1)
+                with patch("publish_sender.send_payload", return_value=True) as send_payload:
+                    self.assertEqual(ps.process_once(), 1)
+                    send_payload.assert_called_once_with({"work_order_id": "wo_2"})
+                with patch("publish_sender.send_payload") as send_payload:
+                    self.assertEqual(ps.process_once(), 0)
+                    send_payload.assert_not_called()
+
+            self.assertEqual(json.loads(state.read_text(encoding="utf-8"))["byte_offset"], pfile.stat().st_size)
+
+    def test_process_once_restarts_when_file_is_replaced(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            pfile = root / "draft_publish_payloads.jsonl"
+            state = root / "publish_sender_state.json"
+            pfile.write_text(json.dumps({"work_order_id": "wo_1"}) + "\n", encoding="utf-8")
+
+            with patch.multiple(ps, PUBLISH_FILE=pfile, STATE_PATH=state):
+                with patch("publish_sender.send_payload", return_value=True):
+                    self.assertEqual(ps.process_once(), 1)
+
+                # A larger replacement file on a new inode, then a same-inode rewrite.
+                replacement = root / "replacement.jsonl"
+                replacement.write_text(
+                    json.dumps({"work_order_id": "wo_2"}) + "\n" + json.dumps({"work_order_id": "wo_3"}) + "\n",
+                    encoding="utf-8",
+                )
+                os.replace(replacement, pfile)
+                with patch("publish_sender.send_payload", return_value=True) as send_payload:
+                    self.assertEqual(ps.process_once(), 2)
+                    self.assertEqual([c.args[0]["work_order_id"] for c in send_payload.call_args_list], ["wo_2", "wo_3"])
+
+                pfile.write_text(
+                    json.dumps({"work_order_id": "wo_4"}) + "\n" + json.dumps({"work_order_id": "wo_5"}) + "\n",
+                    encoding="utf-8",
+                )
+                with patch("publish_sender.send_payload", return_value=True) as send_payload:
+                    self.assertEqual(ps.process_once(), 2)
+                    self.assertEqual([c.args[0]["work_order_id"] for c in send_payload.call_args_list], ["wo_4", "wo_5"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,8 +4,10 @@ import json
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 import review_actions_service as ras
+from jsonl_io import append_row
 
 
 def _write_jsonl(path: Path, rows: list[dict]) -> None:
@@ -55,44 +57,64 @@ class ReviewActionsServiceTests(unittest.TestCase):
                 ],
             )
 
-            old_pipeline = ras.PIPELINE_DIR
-            old_work_orders = ras.WORK_ORDER_STORE
-            old_review_path = ras.REVIEW_ACTIONS_PATH
-            old_esc = ras.ESCALATIONS_PATH
-            old_pub = ras.PUBLISH_PATH
-            old_tone = ras.TONE_PATH
-            try:
-                ras.PIPELINE_DIR = pipeline
-                ras.WORK_ORDER_STORE = work_orders
-                ras.REVIEW_ACTIONS_PATH = pipeline / "review_actions.jsonl"
-                ras.ESCALATIONS_PATH = pipeline / "escalations.jsonl"
-                ras.PUBLISH_PATH = pipeline / "draft_publish_payloads.jsonl"
-                ras.TONE_PATH = pipeline / "tone_checked.jsonl"
-
-                # Patch precedent target by monkeypatching function call site.
-                from precedent_memory import append_precedent as real_append
-
-                def patched_append(sender, labels, tier, decision):  # type: ignore[no-redef]
-                    return real_append(sender, labels, tier, decision, path=memory)
-
-                ras.append_precedent = patched_append  # type: ignore[assignment]
-
+            # Patch precedent target by wrapping the function call site.
+            from precedent_memory import append_precedent as real_append
+
+            def patched_append(sender, labels, tier, decision):  # type: ignore[no-redef]
+                return real_append(sender, labels, tier, decision, path=memory)
+
+            with patch.multiple(
+                ras,
+                PIPELINE_DIR=pipeline,
+                WORK_ORDER_STORE=work_orders,
+                REVIEW_ACTIONS_PATH=pipeline / "review_actions.jsonl",
+                ESCALATIONS_PATH=pipeline / "escalations.jsonl",
+                PUBLISH_PATH=pipeline / "draft_publish_payloads.jsonl",
+                TONE_PATH=pipeline / "tone_checked.jsonl",
+                append_precedent=patched_append,
+            ):
                 result = ras.apply_review_action(
                     {"work_order_id": "wo_1", "action": "approve", "reviewer": "yaakov"}
                 )
-            finally:
-                ras.PIPELINE_DIR = old_pipeline
-                ras.WORK_ORDER_STORE = old_work_orders
-                ras.REVIEW_ACTIONS_PATH = old_review_path
-                ras.ESCALATIONS_PATH = old_esc
-                ras.PUBLISH_PATH = old_pub
-                ras.TONE_PATH = old_tone
 
             self.assertTrue(result["ok"])
             self.assertTrue(result["publish_payload_written"])
             self.assertTrue((pipeline / "draft_publish_payloads.jsonl").exists())
             self.assertTrue(memory.exists())
 
+    def test_latest_by_work_order_follows_appends(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "escalations.jsonl"
+            _write_jsonl(path, [{"work_order_id": "wo_1", "policy_tier": "A"}, {"work_order_id": "wo_2"}])
+            self.assertEqual(ras._latest_by_work_order(path, "wo_1")["policy_tier"], "A")
+            self.assertIsNone(ras._latest_by_work_order(path, "wo_3"))
+
+            append_row(path, {"work_order_id": "wo_1", "policy_tier": "C"})
+            append_row(path, {"work_order_id": "wo_3"})
+            self.assertEqual(ras._latest_by_work_order(path, "wo_1")["policy_tier"], "C")
+            self.assertEqual(ras._latest_by_work_order(path, "wo_3"), {"work_order_id": "wo_3"})
+
+            _write_jsonl(path, [{"work_order_id": "wo_9"}])
+            self.assertIsNone(ras._latest_by_work_order(path, "wo_1"))
+
+    def test_latest_recovers_when_file_changes_after_refresh(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "escalations.jsonl"
+            _write_jsonl(path, [{"work_order_id": "wo_1"}, {"work_order_id": "wo_2", "policy_tier": "A"}])
+            index = ras._JsonlOffsetIndex(path, "work_order_id")
+            refresh = index._refresh
+            rewrites = [[{"work_order_id": "wo_2", "policy_tier": "B"}]]
+
+            def racing_refresh() -> bool:
+                fresh = refresh()
+                if rewrites:
+                    # Truncate and rewrite after the index was checked, before the row is read.
+                    _write_jsonl(path, rewrites.pop())
+                return fresh
+
+            with patch.object(index, "_refresh", side_effect=racing_refresh):
+                self.assertEqual(index.latest("wo_2"), {"work_order_id": "wo_2", "policy_tier": "B"})
+
     def test_edit_approve_requires_edited_body(self) -> None:
         with self.assertRaises(ValueError):
             ras.apply_review_action({"work_order_id": "wo_x", "action": "edit_approve"})
@@ -4,6 +4,7 @@ import json
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 from swarm_ingest import ActionableSwarmIngestor
 from swarm_langgraph.queue import InMemorySwarmJobQueue
@@ -36,7 +37,13 @@ class SwarmIngestTests(unittest.TestCase):
             self.assertEqual(first["rows_enqueued"], 2)
             self.assertEqual(first["rows_skipped"], 1)
             self.assertEqual(second["rows_read"], 0)
-            self.assertEqual(len(queue.jobs), 2)
+            self.assertEqual([job.work_order_id for job in queue.jobs], ["wo_1", "wo_2"])
+
+            state_mtime = state.stat().st_mtime_ns
+            with patch.object(ingestor, "_start_signature", side_effect=AssertionError("idle poll read the file")):
+                self.assertEqual(ingestor.ingest_once()["rows_read"], 0)
+            self.assertEqual(state.stat().st_mtime_ns, state_mtime)
+            self.assertFalse(state.with_name(state.name + ".tmp").exists())
 
     def test_ingest_handles_truncated_file_rotation(self) -> None:
         with tempfile.TemporaryDirectory() as td:
@@ -60,6 +67,28 @@ class SwarmIngestTests(unittest.TestCase):
             self.assertEqual(result["rows_enqueued"], 1)
             self.assertEqual(queue.jobs[-1].work_order_id, "wo_new")
 
+    def test_ingest_tolerates_truncation_before_mapping(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            actionable = root / "actionable.jsonl"
+            actionable.write_text(
+                json.dumps({"work_order": {"id": "wo_1", "sender": "a@example.com"}}) + "\n",
+                encoding="utf-8",
+            )
+            queue = InMemorySwarmJobQueue()
+            ingestor = ActionableSwarmIngestor(queue=queue, actionable_path=actionable, state_path=root / "state.json")
+
+            def truncate_then_sign() -> str:
+                # Runs after the size check and before the file is opened.
+                actionable.write_bytes(b"")
+                return ""
+
+            with patch.object(ingestor, "_start_signature", side_effect=truncate_then_sign):
+                result = ingestor.ingest_once()
+
+            self.assertEqual(result["rows_read"], 0)
+            self.assertEqual(queue.jobs, [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from swarm_langgraph import monday_agents as ma
 from swarm_langgraph.nodes import SwarmNodes
@@ -25,22 +25,27 @@ class SwarmMondayAgentsTests(unittest.TestCase):
                                 {"id": "email", "text": "mario@acme.com"},
                                 {"id": "status", "text": "Proposal Sent"},
                             ],
-                            "updates": [
-                                {
-                                    "id": "u1",
-                                    "body": "Client asked for final legal redlines.",
-                                    "created_at": "2026-02-16T12:00:00Z",
-                                }
-                            ],
                         }
                     ]
                 },
             }
         ]
-        with patch.object(ma, "MONDAY_API_TOKEN", "token"):
-            with patch.object(ma, "MONDAY_BOARD_IDS", "18397429943"):
-                with patch.object(ma, "_boards_with_items_and_updates", return_value=fake_boards):
-                    result = ma.monday_coordinator_agent({"sender": "mario@acme.com"})
+        fake_updates = [
+            {
+                "id": "u1",
+                "body": "Client asked for final legal redlines.",
+                "created_at": "2026-02-16T12:00:00Z",
+            }
+        ]
+        with patch.multiple(
+            ma,
+            MONDAY_API_TOKEN="token",
+            MONDAY_BOARD_IDS="18397429943",
+            _boards_light=MagicMock(return_value=fake_boards),
+            _item_updates=MagicMock(return_value=fake_updates),
+        ):
+            result = ma.monday_coordinator_agent({"sender": "mario@acme.com"})
+            ma._item_updates.assert_called_once_with("i1")
 
         self.assertTrue(result["enabled"])
         self.assertEqual(result["match_confidence"], "high")
@@ -53,6 +58,15 @@ class SwarmMondayAgentsTests(unittest.TestCase):
         self.assertFalse(result["enabled"])
         self.assertIn("monday_not_configured", result["errors"])
 
+    def test_monday_graphql_wraps_connection_errors(self) -> None:
+        import requests
+
+        session = ma._monday_session()
+        with patch.object(ma, "MONDAY_API_TOKEN", "token"):
+            with patch.object(session, "post", side_effect=requests.ConnectionError("down")):
+                with self.assertRaisesRegex(RuntimeError, "Monday API connection error"):
+                    ma._monday_graphql("query { boards { id } }")
+
     def test_swarm_node_merges_monday_context_into_base_context(self) -> None:
         nodes = SwarmNodes()
         ctx = StageContext(
@@ -63,14 +77,7 @@ class SwarmMondayAgentsTests(unittest.TestCase):
                 }
             },
         )
-        state: SwarmState = {
-            "ctx": ctx,
-            "last_result": None,
-            "halt": False,
-            "run_status": "running",
-            "error": None,
-            "output": {},
-        }
+        state = SwarmState(ctx=ctx)
         monday_payload = {
             "enabled": True,
             "crm_context": {"deal_status": "Qualified", "matched_item_id": "i1"},
@@ -92,14 +99,7 @@ class SwarmMondayAgentsTests(unittest.TestCase):
             work_order={"id": "wo1", "sender": "mario@acme.com", "conversation_id": "conv_1"},
             state={"context": {"context": {"crm_enriched_fields": {}}}},
         )
-        state: SwarmState = {
-            "ctx": ctx,
-            "last_result": None,
-            "halt": False,
-            "run_status": "running",
-            "error": None,
-            "output": {},
-        }
+        state = SwarmState(ctx=ctx)
         graph_payload = {
             "enabled": True,
             "thread_context": {"message_count": 2, "participants": ["mario@acme.com"]},
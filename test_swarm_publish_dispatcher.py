@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 
+import asyncio
 import unittest
+from contextlib import contextmanager
+from typing import Iterator
+from unittest.mock import AsyncMock, patch
 
 from swarm_publish_dispatcher import PublishQueueRow, SwarmPublishDispatcher
 
@@ -13,23 +17,37 @@ class _FakeDispatcher(SwarmPublishDispatcher):
         auto_send_enabled: bool = True,
         post_ok: bool = True,
         max_attempts: int = 3,
+        batch: list[PublishQueueRow] | None = None,
     ) -> None:
+        super().__init__(
+            "postgres://fake",
+            "https://example.com/hook",
+            auto_send_enabled=auto_send_enabled,
+            max_attempts=max_attempts,
+            claim_mode="skip_locked",
+        )
         self._row = row
-        self.auto_send_enabled = auto_send_enabled
-        self.max_attempts = max_attempts
-        self.webhook_url = "https://example.com/hook"
+        self._batch = list(batch or [])
         self._post_ok = post_ok
         self.dispatched_notes: list[str] = []
         self.retry_calls: list[tuple[int, int, str]] = []
+        self.batch_updates: list[list[tuple[int, str, str | None, float | None]]] = []
 
     def claim_next(self) -> PublishQueueRow | None:
         row = self._row
         self._row = None
         return row
 
+    def claim_batch(self, limit: int) -> list[PublishQueueRow]:
+        rows, self._batch = self._batch[:limit], self._batch[limit:]
+        return rows
+
     def mark_dispatched(self, row_id: int, note: str = "") -> None:
         self.dispatched_notes.append(note)
 
+    def mark_batch(self, updates: list[tuple[int, str, str | None, float | None]]) -> None:
+        self.batch_updates.append(list(updates))
+
     def mark_retry_or_dead_letter(self, row_id: int, attempt: int, error: str) -> str:
         self.retry_calls.append((row_id, attempt, error))
         return "dead_letter" if attempt >= self.max_attempts else "queued"
@@ -40,6 +58,40 @@ class _FakeDispatcher(SwarmPublishDispatcher):
         return False, "failed"
 
 
+class _RecordingCursor:
+    def __init__(self, statements: list[str], rows: list[tuple]) -> None:
+        self._statements = statements
+        self._rows = rows
+
+    def __enter__(self) -> "_RecordingCursor":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def execute(self, sql: str, params: object = None) -> None:
+        self._statements.append(sql)
+
+    def fetchall(self) -> list[tuple]:
+        rows, self._rows[:] = list(self._rows), []
+        return rows
+
+
+class _RecordingPool:
+    """Stands in for the psycopg pool and records every statement the dispatcher sends."""
+
+    def __init__(self, claim_rows: list[tuple]) -> None:
+        self.statements: list[str] = []
+        self._claim_rows = claim_rows
+
+    @contextmanager
+    def connection(self) -> Iterator["_RecordingPool"]:
+        yield self
+
+    def cursor(self) -> _RecordingCursor:
+        return _RecordingCursor(self.statements, self._claim_rows)
+
+
 class SwarmPublishDispatcherTests(unittest.TestCase):
     def test_process_once_skips_send_false(self) -> None:
         dispatcher = _FakeDispatcher(
@@ -50,6 +102,14 @@ class SwarmPublishDispatcherTests(unittest.TestCase):
         self.assertEqual(result["reason"], "send_false")
         self.assertEqual(dispatcher.dispatched_notes, ["send_false"])
 
+    def test_process_once_uses_claimed_should_send(self) -> None:
+        dispatcher = _FakeDispatcher(
+            PublishQueueRow(row_id=9, work_order_id="wo9", payload={"send": "yes"}, attempt=1, should_send=False)
+        )
+        result = dispatcher.process_once()
+        self.assertEqual(result["status"], "skipped")
+        self.assertEqual(result["reason"], "send_false")
+
     def test_process_once_skips_when_auto_send_disabled(self) -> None:
         dispatcher = _FakeDispatcher(
             PublishQueueRow(row_id=2, work_order_id="wo2", payload={"send": True}, attempt=1),
@@ -85,6 +145,116 @@ class SwarmPublishDispatcherTests(unittest.TestCase):
         dead_result = dead_dispatcher.process_once()
         self.assertEqual(dead_result["status"], "dead_letter")
 
+    def test_process_once_batch_applies_all_updates_together(self) -> None:
+        dispatcher = _FakeDispatcher(
+            None,
+            post_ok=False,
+            max_attempts=3,
+            batch=[
+                PublishQueueRow(row_id=6, work_order_id="wo6", payload={"send": False}, attempt=1),
+                PublishQueueRow(row_id=7, work_order_id="wo7", payload={"send": True}, attempt=1),
+                PublishQueueRow(row_id=8, work_order_id="wo8", payload={"send": True}, attempt=3),
+            ],
+        )
+        result = dispatcher.process_once_batch(limit=10)
+        self.assertEqual(result["claimed"], 3)
+        self.assertEqual([r["status"] for r in result["results"]], ["skipped", "queued", "dead_letter"])
+        (updates,) = dispatcher.batch_updates
+        self.assertEqual(
+            [update[:3] for update in updates],
+            [(6, "dispatched", "send_false"), (7, "queued", "failed"), (8, "dead_letter", "failed")],
+        )
+        # Only the re-queued row gets a jittered backoff delay.
+        self.assertIsNone(updates[0][3])
+        self.assertTrue(0 <= updates[1][3] <= 2.0)
+        self.assertIsNone(updates[2][3])
+        self.assertEqual(dispatcher.process_once_batch(limit=10)["status"], "empty")
+
+    def test_process_batch_async_marks_every_claimed_row(self) -> None:
+        dispatcher = _FakeDispatcher(
+            None,
+            max_attempts=3,
+            batch=[
+                PublishQueueRow(row_id=10, work_order_id="wo10", payload={"id": "ok"}, attempt=1),
+                PublishQueueRow(row_id=11, work_order_id="wo11", payload={"id": "http_500"}, attempt=1),
+                PublishQueueRow(row_id=12, work_order_id="wo12", payload={"send": False}, attempt=1),
+                PublishQueueRow(row_id=13, work_order_id="wo13", payload={"id": "cancelled"}, attempt=3),
+            ],
+        )
+
+        async def fake_post_async(session: object, payload: dict) -> tuple[bool, str]:
+            if payload["id"] == "cancelled":
+                raise asyncio.CancelledError()
+            return (True, "") if payload["id"] == "ok" else (False, "webhook_http_500")
+
+        with patch.multiple(
+            dispatcher,
+            _async_session=AsyncMock(return_value=object()),
+            _post_async=fake_post_async,
+        ):
+            result = asyncio.run(dispatcher.process_batch_async(limit=10))
+
+        self.assertEqual(result["claimed"], 4)
+        self.assertEqual(
+            [r["status"] for r in result["results"]],
+            ["dispatched", "queued", "skipped", "dead_letter"],
+        )
+        (updates,) = dispatcher.batch_updates
+        self.assertEqual(
+            [update[:3] for update in updates],
+            [
+                (10, "dispatched", None),
+                (11, "queued", "webhook_http_500"),
+                (12, "dispatched", "send_false"),
+                (13, "dead_letter", "webhook_exception:CancelledError"),
+            ],
+        )
+        self.assertTrue(0 <= updates[1][3] <= 2.0)
+        self.assertIsNone(updates[3][3])
+
+    def test_atomic_update_mode_sends_only_portable_sql(self) -> None:
+        dispatcher = SwarmPublishDispatcher("postgres://x", "https://hook", True, claim_mode="atomic_update")
+        pool = _RecordingPool(
+            [
+                (1, "wo1", {"send": True}, 1, True),
+                (2, "wo2", {"send": True}, 1, True),
+            ]
+        )
+        dispatcher.pool = pool  # type: ignore[misc]
+        with patch.object(dispatcher, "_post", side_effect=lambda payload: (False, "webhook_http_500")):
+            result = dispatcher.process_once_batch(limit=2)
+        self.assertEqual([r["status"] for r in result["results"]], ["queued", "queued"])
+        dispatcher.mark_retry_or_dead_letter(3, attempt=1, error="boom")
+        dispatcher.mark_dispatched(4)
+
+        claim_sql, batch_sql, retry_sql, dispatched_sql = (" ".join(sql.lower().split()) for sql in pool.statements)
+        self.assertIn("and dispatch_status = 'queued'", claim_sql)
+        self.assertIn("unnest(", batch_sql)
+        self.assertIn("update publish_queue", retry_sql)
+        self.assertIn("dispatch_status = 'dispatched'", dispatched_sql)
+        # CockroachDB rejects these; the atomic_update path must not depend on them.
+        for sql in pool.statements:
+            lowered = sql.lower()
+            for construct in ("make_interval", "skip locked", "for update", "pg_notify"):
+                self.assertNotIn(construct, lowered)
+
+    def test_rejects_unknown_claim_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            SwarmPublishDispatcher("postgres://x", "https://hook", True, claim_mode="nowait")  # type: ignore[arg-type]
+
+    def test_construction_and_close_do_not_open_connections(self) -> None:
+        with patch.object(SwarmPublishDispatcher, "_open_pool", side_effect=AssertionError("pool opened")):
+            dispatcher = _FakeDispatcher(
+                PublishQueueRow(row_id=9, work_order_id="wo9", payload={"send": True}, attempt=1)
+            )
+            self.assertNotIn("pool", vars(dispatcher))
+            self.assertNotIn("_session", vars(dispatcher))
+            # The fake claims, marks and posts without the pool or session, so neither gets opened.
+            self.assertEqual(dispatcher.process_once()["status"], "dispatched")
+            dispatcher.close()
+        self.assertNotIn("pool", vars(dispatcher))
+        self.assertNotIn("_session", vars(dispatcher))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import threading
+import unittest
+
+import swarm_worker_runner as runner
+
+
+class _FakeWakeup:
+    def __init__(self, stop: threading.Event, stop_after: int = 0, notify_on: int = 0) -> None:
+        self.stop = stop
+        self.stop_after = stop_after
+        self.notify_on = notify_on
+        self.timeouts: list[float] = []
+        self.closed = False
+
+    def wait(self, timeout: float) -> bool:
+        self.timeouts.append(timeout)
+        if len(self.timeouts) == self.stop_after:
+            self.stop.set()
+        return len(self.timeouts) == self.notify_on
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class IdleTests(unittest.TestCase):
+    def test_idle_wait_is_sliced_and_stops_early(self) -> None:
+        stop = threading.Event()
+        wakeup = _FakeWakeup(stop, stop_after=2)
+        self.assertIs(runner._idle(wakeup, 30.0, stop), wakeup)
+        self.assertEqual(len(wakeup.timeouts), 2)
+        self.assertTrue(all(t <= 1.0 for t in wakeup.timeouts))
+
+    def test_idle_returns_on_notification(self) -> None:
+        stop = threading.Event()
+        wakeup = _FakeWakeup(stop, notify_on=1)
+        self.assertIs(runner._idle(wakeup, 30.0, stop), wakeup)
+        self.assertEqual(wakeup.timeouts, [1.0])
+        self.assertFalse(stop.is_set())
+
+    def test_idle_skips_wait_once_stopped(self) -> None:
+        stop = threading.Event()
+        stop.set()
+        wakeup = _FakeWakeup(stop)
+        self.assertIs(runner._idle(wakeup, 30.0, stop), wakeup)
+        self.assertEqual(wakeup.timeouts, [])
+
+
+if __name__ == "__main__":
+    unittest.main()